@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -6,4 +7,103 @@ load_dotenv()
 OPEN_ROUTER_API_KEY = os.getenv("OPEN_ROUTER_API_KEY")
 GITHUB_API_TOKEN = os.getenv("GITHUB_API_TOKEN")
 DATABASE_URL = os.getenv("DATABASE_URL")
-HUGGING_FACE_API = os.getenv("HUGGING_FACE_API")
\ No newline at end of file
+HUGGING_FACE_API = os.getenv("HUGGING_FACE_API")
+
+# Local cache files default to an absolute, writable location (serverless filesystems are read-only)
+CACHE_DIR = os.path.abspath(os.getenv("CACHE_DIR", os.path.join(tempfile.gettempdir(), "internship-ai-cache")))
+
+# Embedding cache (SQLite file + in-process LRU)
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", os.path.join(CACHE_DIR, "embeddings.sqlite3"))
+EMBEDDING_CACHE_MAX_ITEMS = int(os.getenv("EMBEDDING_CACHE_MAX_ITEMS", "10000"))
+
+# Embedding API client (batched, rate-limit aware)
+EMBEDDING_API_URL = os.getenv("EMBEDDING_API_URL")
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))
+EMBEDDING_MAX_CONCURRENCY = int(os.getenv("EMBEDDING_MAX_CONCURRENCY", "4"))
+EMBEDDING_MAX_RETRIES = int(os.getenv("EMBEDDING_MAX_RETRIES", "5"))
+
+# Embedding backend: "remote" (Hugging Face API) or "local" (in-process sentence-transformers)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "remote").lower()
+LOCAL_EMBEDDING_WORKERS = int(os.getenv("LOCAL_EMBEDDING_WORKERS", "1"))
+LOCAL_EMBEDDING_DEVICE = os.getenv("LOCAL_EMBEDDING_DEVICE", "cpu")
+
+# Postgres connection pool
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+DB_POOL_HEALTHCHECK_IDLE = float(os.getenv("DB_POOL_HEALTHCHECK_IDLE", "30"))
+
+# Shortlister LLM project assessment
+SHORTLIST_LLM_CONCURRENCY = int(os.getenv("SHORTLIST_LLM_CONCURRENCY", "8"))
+SHORTLIST_LLM_TIMEOUT = float(os.getenv("SHORTLIST_LLM_TIMEOUT", "30"))
+
+# Resume download limits
+RESUME_MAX_BYTES = int(os.getenv("RESUME_MAX_BYTES", str(10 * 1024 * 1024)))
+RESUME_CONNECT_TIMEOUT = float(os.getenv("RESUME_CONNECT_TIMEOUT", "5"))
+RESUME_READ_TIMEOUT = float(os.getenv("RESUME_READ_TIMEOUT", "30"))
+RESUME_DOWNLOAD_DEADLINE = float(os.getenv("RESUME_DOWNLOAD_DEADLINE", "60"))
+
+# PDF extraction: "auto" | "accurate" (pdfplumber) | "fast" (pypdfium2)
+RESUME_MAX_PAGES = int(os.getenv("RESUME_MAX_PAGES", "20"))
+PDF_EXTRACTION_MODE = os.getenv("PDF_EXTRACTION_MODE", "auto").lower()
+PDF_FAST_PATH_PAGES = int(os.getenv("PDF_FAST_PATH_PAGES", "5"))
+
+# Parsed-resume cache ("memory" or "sqlite"), keyed by sha256 of the file bytes
+PARSE_CACHE_BACKEND = os.getenv("PARSE_CACHE_BACKEND", "sqlite").lower()
+PARSE_CACHE_PATH = os.getenv("PARSE_CACHE_PATH", os.path.join(CACHE_DIR, "parsed_resumes.sqlite3"))
+PARSE_CACHE_TTL = float(os.getenv("PARSE_CACHE_TTL", str(7 * 24 * 3600)))
+PARSE_CACHE_MAX_ITEMS = int(os.getenv("PARSE_CACHE_MAX_ITEMS", "5000"))
+
+# Bulk resume parsing
+BATCH_PARSE_MAX_URLS = int(os.getenv("BATCH_PARSE_MAX_URLS", "5000"))
+BATCH_PARSE_WORKERS = int(os.getenv("BATCH_PARSE_WORKERS", "16"))
+BATCH_DOWNLOAD_CONCURRENCY = int(os.getenv("BATCH_DOWNLOAD_CONCURRENCY", "16"))
+BATCH_EXTRACT_CONCURRENCY = int(os.getenv("BATCH_EXTRACT_CONCURRENCY", "4"))
+BATCH_LLM_CONCURRENCY = int(os.getenv("BATCH_LLM_CONCURRENCY", "4"))
+JOB_RESULT_TTL = float(os.getenv("JOB_RESULT_TTL", "3600"))
+
+# Shared LLM (OpenRouter via DSPy/litellm)
+LLM_MODEL_NAME = os.getenv("LLM_MODEL_NAME", "openrouter/qwen/qwen3-14b:free")
+LLM_API_BASE = os.getenv("LLM_API_BASE", "https://openrouter.ai/api/v1")
+LLM_NUM_RETRIES = int(os.getenv("LLM_NUM_RETRIES", "3"))
+
+# Resume text preprocessing (estimated tokens sent to the parser LLM)
+RESUME_TOKEN_BUDGET = int(os.getenv("RESUME_TOKEN_BUDGET", "3000"))
+
+# LLM structured output (extra attempts after local JSON repair fails)
+STRUCTURED_OUTPUT_RETRIES = int(os.getenv("STRUCTURED_OUTPUT_RETRIES", "1"))
+
+# GitHub repository fetch (skill verifier)
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+GITHUB_FETCH_MODE = os.getenv("GITHUB_FETCH_MODE", "tarball").lower()
+GITHUB_FETCH_CONCURRENCY = int(os.getenv("GITHUB_FETCH_CONCURRENCY", "8"))
+GITHUB_TARBALL_MAX_BYTES = int(os.getenv("GITHUB_TARBALL_MAX_BYTES", str(50 * 1024 * 1024)))
+GITHUB_TIMEOUT = float(os.getenv("GITHUB_TIMEOUT", "20"))
+
+# Repository verification cache (keyed by commit SHA, so entries never go stale)
+VERIFY_CACHE_BACKEND = os.getenv("VERIFY_CACHE_BACKEND", "sqlite").lower()
+VERIFY_CACHE_PATH = os.getenv("VERIFY_CACHE_PATH", os.path.join(CACHE_DIR, "repo_verifications.sqlite3"))
+VERIFY_CACHE_TTL = float(os.getenv("VERIFY_CACHE_TTL", str(90 * 24 * 3600)))
+VERIFY_CACHE_MAX_ITEMS = int(os.getenv("VERIFY_CACHE_MAX_ITEMS", "10000"))
+
+# Skill verifier context packing (estimated tokens)
+VERIFY_CONTEXT_TOKEN_BUDGET = int(os.getenv("VERIFY_CONTEXT_TOKEN_BUDGET", "12000"))
+VERIFY_FILE_TOKEN_BUDGET = int(os.getenv("VERIFY_FILE_TOKEN_BUDGET", "2500"))
+VERIFY_MAX_CANDIDATE_FILES = int(os.getenv("VERIFY_MAX_CANDIDATE_FILES", "30"))
+
+# Skill verifier background execution
+VERIFY_WORKERS = int(os.getenv("VERIFY_WORKERS", "4"))
+VERIFY_MAX_QUEUE = int(os.getenv("VERIFY_MAX_QUEUE", "32"))
+
+# Named executors per workload class (see api/utils/executors.py)
+EXECUTOR_CPU_KIND = os.getenv("EXECUTOR_CPU_KIND", "process").lower()
+EXECUTOR_CPU_WORKERS = int(os.getenv("EXECUTOR_CPU_WORKERS", str(os.cpu_count() or 2)))
+EXECUTOR_IO_WORKERS = int(os.getenv("EXECUTOR_IO_WORKERS", "32"))
+EXECUTOR_DB_WORKERS = int(os.getenv("EXECUTOR_DB_WORKERS", str(DB_POOL_MAX_SIZE)))
+EXECUTOR_LLM_WORKERS = int(os.getenv("EXECUTOR_LLM_WORKERS", "8"))
+
+# Shortlist score-component cache (per job; re-weighted on read, invalidated per applicant)
+SHORTLIST_CACHE_BACKEND = os.getenv("SHORTLIST_CACHE_BACKEND", "sqlite").lower()
+SHORTLIST_CACHE_PATH = os.getenv("SHORTLIST_CACHE_PATH", os.path.join(CACHE_DIR, "shortlists.sqlite3"))
+SHORTLIST_CACHE_TTL = float(os.getenv("SHORTLIST_CACHE_TTL", str(24 * 3600)))
+SHORTLIST_CACHE_MAX_ITEMS = int(os.getenv("SHORTLIST_CACHE_MAX_ITEMS", "500"))
\ No newline at end of file
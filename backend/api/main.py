@@ -3,18 +3,30 @@ from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
 
 from api.routers.resume_parser import router as resume_router
-# from app.routers.skill_verifier import router as verifier_router
+from api.routers.skill_verifier import router as verifier_router
 from api.routers.ai_shortlister import router as shortlist_router
+from api.routers.ai_shortlister import load_embedding_provider, close_embedding_provider
+from api.utils.db import init_db_pool, close_db_pool
+from api.utils.jobs import JOB_STORE
+from api.utils.lm_registry import init_lm_registry, close_lm_registry
+from api.utils.executors import EXECUTORS, init_executors, close_executors
 # from app.routers.ai_shortlister import router as shortlist_router
-# from app.routers.ai_shortlister import load_model
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("INFO:     Server starting up...")
-    # load_model()
+    init_db_pool()
+    init_executors()
+    init_lm_registry()
+    load_embedding_provider()
     print("INFO:     Application startup complete. Server is ready.")
     yield
     print("INFO:     Application shutting down.")
+    await JOB_STORE.cancel_all()
+    await close_embedding_provider()
+    close_lm_registry()
+    close_executors()
+    close_db_pool()
 
 app = FastAPI(lifespan=lifespan)
 
@@ -38,12 +50,17 @@ app.include_router(
     tags=["Resume Parser"]
 )
 
-# app.include_router(
-#     verifier_router, 
-#     prefix="/api/v1", 
-#     tags=["Skill Verifier"]
-# )
+app.include_router(
+    verifier_router, 
+    prefix="/api/v1", 
+    tags=["Skill Verifier"]
+)
 
 @app.get("/")
 def root():
-    return {"message": "Hello from FastAPI!"}
\ No newline at end of file
+    return {"message": "Hello from FastAPI!"}
+
+@app.get("/executors")
+async def executor_stats():
+    """Per-executor size and saturation counters (active, queued, peak, saturated submissions)."""
+    return EXECUTORS.stats()
\ No newline at end of file
@@ -1,4 +1,53 @@
-from pydantic import BaseModel
+import json
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field, field_validator
 
 class ResumeUrlRequest(BaseModel):
-    url: str
\ No newline at end of file
+    url: str
+    # "fast" skips the LLM and returns only rule-extracted fields
+    mode: Literal["full", "fast"] = "full"
+
+class ResumeBatchRequest(BaseModel):
+    urls: List[str] = Field(..., min_length=1)
+    mode: Literal["full", "fast"] = "full"
+
+class ParsedResume(BaseModel):
+    """LLM output for /parse-resume. Every field is optional since only a subset may be requested."""
+    name: Optional[str] = None
+    gender: Optional[str] = None
+    source: Optional[str] = None
+    appliedFor: Optional[str] = None
+    appliedDate: Optional[str] = None
+    status: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    college: Optional[str] = None
+    course: Optional[str] = None
+    year: Optional[str] = None
+    cgpa: Optional[str] = None
+    skills: List[str] = Field(default_factory=list)
+    experience: Optional[str] = None
+
+    @field_validator("skills", mode="before")
+    @classmethod
+    def _coerce_skills(cls, value):
+        if value is None:
+            return []
+        if isinstance(value, str):
+            return [s.strip() for s in value.split(",") if s.strip()]
+        return value
+
+    @field_validator(
+        "name", "gender", "source", "appliedFor", "appliedDate", "status", "email",
+        "phone", "college", "course", "year", "cgpa", "experience", mode="before"
+    )
+    @classmethod
+    def _coerce_text(cls, value):
+        # LLMs often return numbers for year/cgpa and lists/objects for experience
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return str(value)
+        if isinstance(value, list):
+            return "\n".join(v if isinstance(v, str) else json.dumps(v) for v in value)
+        if isinstance(value, dict):
+            return json.dumps(value)
+        return value
\ No newline at end of file
@@ -1,3 +1,4 @@
+from typing import Optional
 from pydantic import BaseModel, Field
 
 class SkillMastery(BaseModel):
@@ -15,3 +16,5 @@ class VerificationResponse(BaseModel):
 
 class RepoUrlRequest(BaseModel):
     url: str
+    # When set, the result is also written to this applicant's Project/VerifiedSkill rows
+    applicant_id: Optional[str] = None
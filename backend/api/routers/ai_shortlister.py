@@ -1,14 +1,26 @@
 import os
-import dspy
-import httpx # Library for making async HTTP requests
-from fastapi import APIRouter, HTTPException, Query
-from typing import List, Optional, Any, Callable, Dict
-from contextlib import contextmanager
-import asyncio 
+from fastapi import APIRouter, HTTPException, Query, BackgroundTasks
+from typing import List, Optional
+from functools import partial
 
 # Assuming these imports exist based on the provided context
-from api.utils.shortlister_utils import get_shortlist_logic_hybrid, ApplicantScore
+from api.utils.shortlister_utils import (
+    get_shortlist_logic_hybrid, precompute_applicant_features, ApplicantScore
+)
 from api.models.shortlister_models import ProjectLevelAssessor
+from api.config.config import (
+    EMBEDDING_CACHE_PATH, EMBEDDING_CACHE_MAX_ITEMS, HUGGING_FACE_API, EMBEDDING_API_URL,
+    EMBEDDING_BATCH_SIZE, EMBEDDING_MAX_CONCURRENCY, EMBEDDING_MAX_RETRIES,
+    EMBEDDING_BACKEND, LOCAL_EMBEDDING_WORKERS, LOCAL_EMBEDDING_DEVICE,
+    SHORTLIST_LLM_CONCURRENCY, LLM_MODEL_NAME
+)
+from api.utils.embedding_cache import EmbeddingCache
+from api.utils.embedding_client import HuggingFaceEmbeddingClient
+from api.utils.embedding_providers import EmbeddingProvider, LocalEmbeddingProvider
+from api.utils.lm_registry import LM_REGISTRY
+from api.utils.executors import EXECUTORS
+from api.utils.singleflight import SingleFlight
+from api.utils.shortlist_cache import mark_applicants_stale, invalidate_job
 
 # Check for required API Key (only OpenRouter is mandatory)
 OPEN_ROUTER_API_KEY = os.getenv("OPEN_ROUTER_API_KEY")
@@ -16,32 +28,29 @@ OPEN_ROUTER_API_KEY = os.getenv("OPEN_ROUTER_API_KEY")
 if not OPEN_ROUTER_API_KEY:
     raise EnvironmentError("FATAL: Missing environment variable: OPENROUTER_API_KEY")
 
-# Global instances for thread-safe model loading
+# Global instances for thread-safe model loading; the LM itself lives in LM_REGISTRY
 ASSESSOR_MODULE: Optional[ProjectLevelAssessor] = None
-LLM_MODEL_NAME = "openrouter/qwen/qwen3-14b:free" 
-LLM_INSTANCE: Optional[dspy.LM] = None
 
-# Using the public (free) inference API endpoint for sentence-transformers/all-mpnet-base-v2
-# NOTE: This endpoint is subject to high latency and heavy rate limits, but is cost-free.
-HUGGINGFACE_API_URL = "https://api-inference.huggingface.co/models/sentence-transformers/all-mpnet-base-v2"
-HTTP_CLIENT = httpx.AsyncClient(timeout=60.0) # Shared async HTTP client
+# Embedding provider for sentence-transformers/all-mpnet-base-v2, chosen by EMBEDDING_BACKEND:
+# - "remote": the public (free) Hugging Face inference API. Subject to high latency and heavy
+#   rate limits, so texts are batched with bounded concurrency and 429/503 backoff.
+# - "local": the same model loaded in-process and run on a dedicated CPU worker pool.
+EMBEDDING_MODEL_NAME = "sentence-transformers/all-mpnet-base-v2"
+EMBEDDING_PROVIDER: Optional[EmbeddingProvider] = None
+
+# Embeddings are cached by sha256(model + text), so unchanged resumes are never re-embedded
+EMBEDDING_CACHE: Optional[EmbeddingCache] = None
 
 def initialize_ai_models():
     """Initializes the DSPy Assessor once."""
-    global ASSESSOR_MODULE, LLM_INSTANCE
+    global ASSESSOR_MODULE
 
-    # 1. Initialize DSPy/LLM components
+    # 1. Initialize DSPy components
     if ASSESSOR_MODULE is None:
         try:
-            LLM_INSTANCE = dspy.OpenAI(
-                model=LLM_MODEL_NAME, 
-                api_key=OPEN_ROUTER_API_KEY, 
-                api_base="https://openrouter.ai/api/v1"
-            )
             # Initialize the DSPy module class
             ASSESSOR_MODULE = ProjectLevelAssessor()
             print("INFO: DSPy Assessor module initialized.")
-            print("INFO: Using FREE, rate-limited public Hugging Face endpoint for embeddings.")
 
         except Exception as e:
             print(f"FATAL: Could not configure DSPy/OpenRouter or initialize Assessor: {e}")
@@ -54,64 +63,58 @@ except Exception as e:
     print(f"ERROR during AI model initialization: {e}")
 
 
-@contextmanager
-def dspy_llm_context(lm: dspy.LM):
-    """A context manager to safely configure and unconfigure the DSPy LM globally 
-    for the duration of a synchronous function call."""
-    old_lm = dspy.settings.lm
-    dspy.configure(lm=lm)
-    try:
-        yield
-    finally:
-        dspy.configure(lm=old_lm)
+def load_embedding_provider():
+    """Creates the configured embedding provider and cache once (called from the lifespan)."""
+    global EMBEDDING_PROVIDER, EMBEDDING_CACHE
 
-# --- Hugging Face API Call Function (Unauthenticated) ---
-async def get_embedding(text: str) -> List[float]:
-    """
-    Fetches sentence embedding for a given text using the Hugging Face public Inference API.
-    This is unauthenticated and free, but subject to rate limits and instability.
-    """
-    if not text:
-        # Note: all-mpnet-base-v2 produces a 768-dimension embedding
-        return [0.0] * 768 
+    if EMBEDDING_PROVIDER is not None:
+        return
 
-    # Headers are empty to use the unauthenticated, free public endpoint
-    headers = {} 
-    
-    # HF endpoint takes a JSON body with inputs
-    payload = {"inputs": text}
-    
-    try:
-        response = await HTTP_CLIENT.post(HUGGINGFACE_API_URL, headers=headers, json=payload)
-        response.raise_for_status() # Raise exception for bad status codes (4xx or 5xx)
-        
-        embedding_data = response.json()
-        
-        if not embedding_data or not isinstance(embedding_data, list):
-             raise ValueError("Hugging Face API returned an unexpected response format.")
-
-        return embedding_data[0] if embedding_data else [0.0] * 768
-        
-    except httpx.HTTPStatusError as e:
-        print(f"ERROR: Hugging Face API HTTP error in FREE mode: {e.response.text}")
-        detail_message = (
-            f"Hugging Face Free API failed: {e.response.status_code}. "
-            "Likely a rate limit error due to concurrent processing. "
-            "Please wait or upgrade to a PRO account for stability."
+    if EMBEDDING_BACKEND == "local":
+        provider = LocalEmbeddingProvider(
+            model_name=EMBEDDING_MODEL_NAME,
+            batch_size=EMBEDDING_BATCH_SIZE,
+            max_workers=LOCAL_EMBEDDING_WORKERS,
+            device=LOCAL_EMBEDDING_DEVICE
         )
-        raise HTTPException(
-            status_code=502, 
-            detail=detail_message
+    else:
+        provider = HuggingFaceEmbeddingClient(
+            model_name=EMBEDDING_MODEL_NAME,
+            api_url=EMBEDDING_API_URL,
+            api_token=HUGGING_FACE_API,
+            batch_size=EMBEDDING_BATCH_SIZE,
+            max_concurrency=EMBEDDING_MAX_CONCURRENCY,
+            max_retries=EMBEDDING_MAX_RETRIES
         )
-    except Exception as e:
-        print(f"ERROR: General error during Hugging Face call: {e}")
-        raise HTTPException(status_code=500, detail="Error fetching embedding from external service.")
+    provider.load()
+
+    EMBEDDING_PROVIDER = provider
+    EMBEDDING_CACHE = EmbeddingCache(
+        model_name=provider.model_name,
+        db_path=EMBEDDING_CACHE_PATH,
+        max_memory_items=EMBEDDING_CACHE_MAX_ITEMS
+    )
+    print(f"INFO: Embedding provider ready ({EMBEDDING_BACKEND}: {provider.model_name}).")
+
+async def close_embedding_provider():
+    """Releases the embedding provider and the cache file (called on shutdown)."""
+    global EMBEDDING_PROVIDER, EMBEDDING_CACHE
+
+    if EMBEDDING_PROVIDER is not None:
+        await EMBEDDING_PROVIDER.aclose()
+        EMBEDDING_PROVIDER = None
+    if EMBEDDING_CACHE is not None:
+        EMBEDDING_CACHE.close()
+        EMBEDDING_CACHE = None
 
 # ----------------------------------------------------------
 # Router Definition
 # ----------------------------------------------------------
 router = APIRouter()
 
+# Identical shortlist requests in flight (same job, weights and page) share one computation
+SHORTLIST_FLIGHTS = SingleFlight("Shortlister")
+
 @router.get("/internships/{job_id}/shortlist", response_model=List[ApplicantScore])
 async def get_ai_shortlist(
     job_id: str,
@@ -121,15 +124,18 @@ async def get_ai_shortlist(
     weight_ocr_skills: float = Query(0.15, ge=0, le=1, description="Weight for claimed skills match (OCR)."),
     weight_project_level: float = Query(0.10, ge=0, le=1, description="Weight for project difficulty level (LLM-assessed)."),
     weight_bonus_skills: float = Query(0.10, ge=0, le=1, description="Weight for preferred skills match."),
-    weight_project_relevance: float = Query(0.05, ge=0, le=1, description="Weight for semantic project relevance.")
+    weight_project_relevance: float = Query(0.05, ge=0, le=1, description="Weight for semantic project relevance."),
+    # Pagination over the ranking (omit top_k to return everyone)
+    top_k: Optional[int] = Query(None, ge=1, description="Number of top-ranked applicants to return."),
+    offset: int = Query(0, ge=0, description="Number of top-ranked applicants to skip.")
 ): 
     """
     Generates a weighted shortlist of applicants for a given internship job ID.
     
-    This endpoint orchestrates database lookups, LLM project assessment, 
-    and Hugging Face-based semantic scoring using the UNATHENTICATED/FREE API.
+    This endpoint orchestrates database lookups, LLM project assessment,
+    and semantic scoring with the embedding provider selected by EMBEDDING_BACKEND.
     """
-    if ASSESSOR_MODULE is None or LLM_INSTANCE is None:
+    if ASSESSOR_MODULE is None or not LM_REGISTRY.is_ready("shortlister") or EMBEDDING_PROVIDER is None:
         raise HTTPException(
             status_code=503, 
             detail="AI models are not initialized. Check server logs."
@@ -155,11 +161,61 @@ async def get_ai_shortlist(
         "bonus_skills": weight_bonus_skills, "project_relevance": weight_project_relevance
     }
     
-    # 3. Call the Hybrid Orchestration function directly (it handles the threadpooling internally)
-    return await get_shortlist_logic_hybrid( 
+    # 3. Call the Hybrid Orchestration function directly (it handles the executors internally);
+    #    concurrent identical requests await the same run
+    flight_key = (job_id, tuple(sorted(weights.items())), top_k, offset)
+    return await SHORTLIST_FLIGHTS.do(flight_key, lambda: get_shortlist_logic_hybrid(
         job_id=job_id, 
         weights=weights,
-        embedding_function=get_embedding, 
+        embedding_function=EMBEDDING_PROVIDER.embed, 
+        embedding_model_name=EMBEDDING_PROVIDER.model_name,
+        embedding_cache=EMBEDDING_CACHE,
+        assessor_module=ASSESSOR_MODULE,
+        llm_context_factory=partial(LM_REGISTRY.context, "shortlister"),
+        llm_model_name=LLM_MODEL_NAME,
+        llm_concurrency=SHORTLIST_LLM_CONCURRENCY,
+        top_k=top_k,
+        offset=offset
+    ))
+
+
+@router.post("/internships/{job_id}/shortlist/invalidate")
+async def invalidate_ai_shortlist(
+    job_id: str,
+    applicant_id: Optional[List[str]] = Query(None, description="Rescore only these applicants; omit to drop the whole cached shortlist.")
+):
+    """
+    Invalidates the cached score components for a job. Changes that bump the DB
+    `updatedAt`/`createdAt` columns are detected on read; this covers anything else.
+    """
+    if applicant_id:
+        await EXECUTORS.run("io", mark_applicants_stale, job_id, applicant_id)
+        return {"job_id": job_id, "status": "rescore_scheduled", "applicants": applicant_id}
+    await EXECUTORS.run("io", invalidate_job, job_id)
+    return {"job_id": job_id, "status": "invalidated"}
+
+
+@router.post("/applicants/{applicant_id}/features", status_code=202)
+async def ingest_applicant_features(applicant_id: str, background_tasks: BackgroundTasks):
+    """
+    Schedules precomputation of an applicant's shortlist features (resume/project
+    embeddings and project level). Call when an application is created or a
+    resume is parsed so that shortlisting only loads stored vectors.
+    """
+    if ASSESSOR_MODULE is None or not LM_REGISTRY.is_ready("shortlister") or EMBEDDING_PROVIDER is None:
+        raise HTTPException(
+            status_code=503, 
+            detail="AI models are not initialized. Check server logs."
+        )
+
+    background_tasks.add_task(
+        precompute_applicant_features,
+        applicant_id=applicant_id,
         assessor_module=ASSESSOR_MODULE,
-        llm_context_manager=dspy_llm_context(LLM_INSTANCE)
-    )
\ No newline at end of file
+        llm_context_factory=partial(LM_REGISTRY.context, "shortlister"),
+        llm_model_name=LLM_MODEL_NAME,
+        embedding_function=EMBEDDING_PROVIDER.embed,
+        embedding_model_name=EMBEDDING_PROVIDER.model_name,
+        embedding_cache=EMBEDDING_CACHE
+    )
+    return {"applicant_id": applicant_id, "status": "scheduled"}
\ No newline at end of file
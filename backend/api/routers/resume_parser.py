@@ -1,44 +1,79 @@
 import json
+import asyncio
+import hashlib
 import dspy
-from fastapi import APIRouter, HTTPException
-from fastapi.concurrency import run_in_threadpool
-import re # Import the regular expression module
+from contextlib import nullcontext
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 
-from api.config.config import OPEN_ROUTER_API_KEY
-from api.models.resume_parser_models import ResumeUrlRequest
-from api.utils.pdf_utils import load_and_extract
+from api.config.config import (
+    OPEN_ROUTER_API_KEY, LLM_MODEL_NAME, PARSE_CACHE_BACKEND, PARSE_CACHE_PATH, PARSE_CACHE_TTL, PARSE_CACHE_MAX_ITEMS,
+    BATCH_PARSE_MAX_URLS, BATCH_PARSE_WORKERS, BATCH_DOWNLOAD_CONCURRENCY, BATCH_EXTRACT_CONCURRENCY,
+    BATCH_LLM_CONCURRENCY, RESUME_TOKEN_BUDGET
+)
+from api.models.resume_parser_models import ResumeUrlRequest, ResumeBatchRequest, ParsedResume
+from api.utils.jobs import Job, JOB_STORE
+from api.utils.lm_registry import LM_REGISTRY
+from api.utils.structured_output import generate_structured
+from api.utils.pdf_utils import resolve_gdrive_url, detect_file_type, fetch_file, download_file
+from api.utils.result_cache import create_cache_backend
+from api.utils.cpu_tasks import extract_and_prepare
+from api.utils.resume_rules import guess_name
+from api.utils.executors import EXECUTORS
+from api.utils.singleflight import SingleFlight
 
 if not OPEN_ROUTER_API_KEY:
     raise EnvironmentError("OPEN_ROUTER_API_KEY not found")
 
 router = APIRouter()
 
+# Bump when the prompt/schema changes so stale parses are not served
+PARSER_VERSION = "4"
+
+# Parsed results keyed by sha256 of the file bytes; "url:<url>" entries map a URL's ETag to that hash
+PARSE_CACHE = create_cache_backend(
+    PARSE_CACHE_BACKEND,
+    path=PARSE_CACHE_PATH,
+    max_items=PARSE_CACHE_MAX_ITEMS,
+    default_ttl=PARSE_CACHE_TTL
+)
+
 # ----------------------------------------------------------
 # DSPy Signature for AI Module
 # ----------------------------------------------------------
+RESUME_SCHEMA = {
+    "name": "string or null",
+    "gender": "string or null",
+    "source": "string or null",
+    "appliedFor": "string or null",
+    "appliedDate": "string or null",
+    "status": "string or null",
+    "email": "string or null",
+    "phone": "string or null",
+    "college": "string or null",
+    "course": "string or null",
+    "year": "string or null",
+    "cgpa": "string or null",
+    "skills": ["list", "of", "strings"],
+    "experience": "string or null",
+    "resumeUrl": "string or null"
+}
+
+# Fields api/utils/resume_rules.py fills on its own when found; the LLM is asked for the rest.
+# Skills are always asked for too: the rule vocabulary is small, so its matches are only added on top.
+RULE_FIELDS = ("email", "phone", "cgpa")
+FUZZY_FIELDS = [f for f in RESUME_SCHEMA if f not in RULE_FIELDS and f != "resumeUrl"]
+
+
 class ResumeParser(dspy.Module):
     def __init__(self):
         super().__init__()
         self.predict = dspy.Predict("prompt -> output_json")
 
-    def forward(self, raw_text: str):
-        schema = {
-            "name": "string or null",
-            "gender": "string or null",
-            "source": "string or null",
-            "appliedFor": "string or null",
-            "appliedDate": "string or null",
-            "status": "string or null",
-            "email": "string or null",
-            "phone": "string or null",
-            "college": "string or null",
-            "course": "string or null",
-            "year": "string or null",
-            "cgpa": "string or null",
-            "skills": ["list", "of", "strings"],
-            "experience": "string or null",
-            "resumeUrl": "string or null"
-        }
+    def forward(self, raw_text: str, fields: Optional[List[str]] = None, feedback: Optional[str] = None):
+        # Only ask for the requested fields (defaults to the full schema)
+        schema = {f: RESUME_SCHEMA[f] for f in (fields or RESUME_SCHEMA)}
 
         # IMPORTANT: Reinforce the single-output instruction in the prompt
         prompt = f"""
@@ -60,6 +95,8 @@ class ResumeParser(dspy.Module):
         Resume Text:
         {raw_text}
         """
+        if feedback:
+            prompt += feedback
 
         out = self.predict(prompt=prompt)
         return out.output_json
@@ -68,69 +105,225 @@ class ResumeParser(dspy.Module):
 ai_model = ResumeParser()
 
 # ----------------------------------------------------------
-# Endpoint
+# Download + content-addressed cache lookup
 # ----------------------------------------------------------
+def _parse_cache_key(digest: str, mode: str) -> str:
+    return f"resume:{PARSER_VERSION}:{mode}:{LLM_MODEL_NAME}:{RESUME_TOKEN_BUDGET}:{digest}"
+
+
+def _download_resume(url: str) -> tuple[str, str, Optional[bytes]]:
+    """
+    Returns (file_type, sha256, content). If the URL's ETag is known and the
+    server answers 304, the stored hash is reused and content is None.
+    """
+    url = resolve_gdrive_url(url)
+    file_type = detect_file_type(url)
+
+    known = PARSE_CACHE.get(f"url:{url}")
+    content, etag = fetch_file(url, etag=known["etag"] if known else None)
+    if content is None:
+        return file_type, known["sha256"], None
+
+    digest = hashlib.sha256(content).hexdigest()
+    if etag:
+        PARSE_CACHE.set(f"url:{url}", {"etag": etag, "sha256": digest})
+    return file_type, digest, content
+
+
+def _merge_skills(*skill_lists: List[str]) -> List[str]:
+    """Order-preserving union, case-insensitive (the first spelling wins)."""
+    merged = {}
+    for skills in skill_lists:
+        for skill in skills:
+            merged.setdefault(skill.strip().casefold(), skill.strip())
+    merged.pop("", None)
+    return list(merged.values())
+
+
+def _with_request_fields(data: dict, url: str) -> dict:
+    """Injects the per-request field on a copy (cached results are URL-independent)."""
+    return {**data, "resumeUrl": url}
+
+# ----------------------------------------------------------
+# LLM parsing (blocking; run on the "llm" executor)
+# ----------------------------------------------------------
+def _llm_parse(raw_text: str, fields: Optional[List[str]] = None) -> dict:
+    fields = fields or FUZZY_FIELDS + list(RULE_FIELDS)
+    try:
+        with LM_REGISTRY.context("resume_parser"):
+            # Validated against ParsedResume; malformed output is repaired locally
+            # and only re-requested (once) if repair fails
+            parsed = generate_structured(
+                lambda feedback: ai_model(raw_text=raw_text, fields=fields, feedback=feedback),
+                ParsedResume,
+                label="Resume parser"
+            )
+        return parsed.model_dump(include=set(fields))
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        print("OTHER ERROR:", type(e).__name__, str(e))
+        raise HTTPException(500, f"AI Error: {e}")
+
+# ----------------------------------------------------------
+# Pipeline: download -> extract -> LLM, each stage optionally rate-limited
+# ----------------------------------------------------------
+_NO_LIMITS = {
+    "download": nullcontext(),
+    "extract": nullcontext(),
+    "llm": nullcontext()
+}
+
+
+async def _parse_resume_url(url: str, limits: dict, mode: str) -> dict:
+    # ---------------------------
+    # 1. Download (conditional) + cache lookup
+    # ---------------------------
+    async with limits["download"]:
+        file_type, digest, content = await EXECUTORS.run("io", _download_resume, url)
+
+    cache_key = _parse_cache_key(digest, mode)
+    cached = await EXECUTORS.run("io", PARSE_CACHE.get, cache_key)
+    if cached is not None:
+        print(f"INFO: Parse cache hit for {digest[:12]}.")
+        return _with_request_fields(cached, url)
+
+    if content is None:
+        # ETag matched but the parse result was evicted: fetch the bytes again
+        async with limits["download"]:
+            content = await EXECUTORS.run("io", download_file, url)
 
-@router.post("/parse-resume")
-async def parse_resume(req: ResumeUrlRequest):
     # ---------------------------
-    # 1. Extract raw text + links
+    # 2. Extract raw text + links
     # ---------------------------
-    result = await run_in_threadpool(load_and_extract, req.url)
+    async with limits["extract"]:
+        result = await EXECUTORS.run("cpu", extract_and_prepare, content, file_type, RESUME_TOKEN_BUDGET)
 
     raw_text = result["raw_text"]
     links = result["links"]
 
-    # configuration of DSPy + OpenRouter
-    qwen_lm=dspy.LM(
-        api_key=OPEN_ROUTER_API_KEY,
-        model="openrouter/qwen/qwen3-14b:free",
-        api_base="https://openrouter.ai/api/v1"
-    )
-    dspy.configure(lm=qwen_lm)
-
     # ---------------------------
-    # 2. AI parses based on raw text
+    # 3. Rules first; AI parses the cleaned text for whatever is left
+    #    (rawResumeText keeps the full extraction)
     # ---------------------------
-    try:
-        with dspy.context(lm=qwen_lm):
-            # Step 1: Get the raw, potentially messy output from the LLM
-            llm_raw_output = ai_model(raw_text=raw_text)
-            
-            # Step 2: Use regex to find and extract the valid JSON object
-            # This looks for the content between the first '{' and the last '}'
-            # This is the most robust way to handle LLM preamble/postamble text.
-            match = re.search(r'\{.*\}', llm_raw_output, re.DOTALL)
-            
-            if match:
-                json_str = match.group(0)
-            else:
-                # If regex fails, assume the whole string is the JSON (less safe)
-                json_str = llm_raw_output.strip()
-
-            # Step 3: Attempt to load the cleaned string
-            data = json.loads(json_str)
-
-    except json.JSONDecodeError as e:
-        # Catch specific JSON error and log the raw output for better debugging
-        print(f"JSON DECODE ERROR: {e}. Raw LLM output was: \n{llm_raw_output}")
-        raise HTTPException(
-            status_code=500, 
-            detail=f"AI Error: Failed to parse valid JSON from LLM. (Error: {e})"
-        )
-    except Exception as e:
-        print("OTHER ERROR:", type(e).__name__, str(e))
-        raise HTTPException(500, f"AI Error: {e}")
+    rule_fields = dict(result["rule_fields"])
+    rule_skills = rule_fields.pop("skills", [])
+    if mode == "fast":
+        data = {"name": guess_name(result["llm_text"])}
+    else:
+        fields = FUZZY_FIELDS + [f for f in RULE_FIELDS if f not in rule_fields]
+        async with limits["llm"]:
+            data = await EXECUTORS.run("llm", _llm_parse, result["llm_text"], fields)
+    # Deterministic values take precedence over the LLM's; skills are the union of both
+    data.update(rule_fields)
+    data["skills"] = _merge_skills(data.get("skills") or [], rule_skills)
 
     # ---------------------------
-    # 3. Add additional fields
+    # 4. Add additional fields
     # ---------------------------
     # Set default values and inject backend-controlled fields
-    data["resumeUrl"] = req.url
     data["links"] = links
     data["rawResumeText"] = raw_text
     data.setdefault("source", "Company Website")
     data.setdefault("status", "Applied")
     data.setdefault("appliedDate", None)
 
-    return data
\ No newline at end of file
+    await EXECUTORS.run("io", PARSE_CACHE.set, cache_key, data)
+    return _with_request_fields(data, url)
+
+# Concurrent parses of the same URL (double-submits, repeated batch entries) share one run
+PARSE_FLIGHTS = SingleFlight("Resume parser")
+
+
+async def parse_resume_url(url: str, limits: dict = _NO_LIMITS, mode: str = "full") -> dict:
+    """
+    Full parse of one resume URL. `limits` maps each stage name to an async
+    context manager (e.g. a semaphore) bounding how many items run that stage at once.
+
+    Email, phone, CGPA, skills and profile links come from deterministic rules;
+    the LLM is asked only for the remaining fields ("full"), or skipped ("fast").
+    """
+    return await PARSE_FLIGHTS.do((url, mode), lambda: _parse_resume_url(url, limits, mode))
+
+# ----------------------------------------------------------
+# Endpoints
+# ----------------------------------------------------------
+
+@router.post("/parse-resume")
+async def parse_resume(req: ResumeUrlRequest):
+    return await parse_resume_url(req.url, mode=req.mode)
+
+
+# Shared across all batch jobs so concurrent imports cannot multiply the load
+BATCH_STAGE_LIMITS = {
+    "download": asyncio.Semaphore(BATCH_DOWNLOAD_CONCURRENCY),
+    "extract": asyncio.Semaphore(BATCH_EXTRACT_CONCURRENCY),
+    "llm": asyncio.Semaphore(BATCH_LLM_CONCURRENCY)
+}
+
+
+async def _run_batch(job: Job, urls: List[str], mode: str):
+    queue: asyncio.Queue = asyncio.Queue()
+    for index, url in enumerate(urls):
+        queue.put_nowait((index, url))
+
+    async def worker():
+        while True:
+            try:
+                index, url = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                data = await parse_resume_url(url, BATCH_STAGE_LIMITS, mode)
+                item = {"index": index, "url": url, "status": "ok", "data": data}
+            except HTTPException as e:
+                item = {"index": index, "url": url, "status": "error", "error": e.detail}
+            except Exception as e:
+                print(f"ERROR: Batch item {index} ({url}) failed: {type(e).__name__}: {e}")
+                item = {"index": index, "url": url, "status": "error", "error": str(e)}
+            await job.add_result(item)
+
+    await job.set_stage("parsing")
+    try:
+        await asyncio.gather(*(worker() for _ in range(min(BATCH_PARSE_WORKERS, len(urls)))))
+    except Exception as e:
+        print(f"ERROR: Batch job {job.id} aborted: {e}")
+        await job.finish(error=str(e))
+        return
+    await job.finish()
+    print(f"INFO: Batch job {job.id} done: {job.succeeded} parsed, {job.failed} failed.")
+
+
+@router.post("/parse-resume/batch", status_code=202)
+async def parse_resume_batch(req: ResumeBatchRequest):
+    """
+    Queues many resume URLs for parsing and returns a job id immediately.
+    Poll `/parse-resume/batch/{job_id}` or stream `/parse-resume/batch/{job_id}/results`.
+    """
+    if len(req.urls) > BATCH_PARSE_MAX_URLS:
+        raise HTTPException(413, f"A batch may contain at most {BATCH_PARSE_MAX_URLS} URLs.")
+
+    job = JOB_STORE.create("parse-resume", total=len(req.urls))
+    job.task = asyncio.create_task(_run_batch(job, req.urls, req.mode))
+    return job.summary()
+
+
+@router.get("/parse-resume/batch/{job_id}")
+async def get_parse_resume_batch(job_id: str):
+    return JOB_STORE.get(job_id, kind="parse-resume").summary()
+
+
+@router.get("/parse-resume/batch/{job_id}/results")
+async def stream_parse_resume_batch(job_id: str, offset: int = Query(0, ge=0)):
+    """
+    Streams results as newline-delimited JSON in completion order, starting
+    after `offset` already-seen items. The response ends once the job finishes.
+    """
+    job = JOB_STORE.get(job_id, kind="parse-resume")
+
+    async def lines():
+        async for item in job.stream(start=offset):
+            yield json.dumps(item) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
@@ -1,27 +1,38 @@
-import os
-import base64
-import json
 import dspy
+import asyncio
+from typing import Callable, Optional
 from fastapi import APIRouter, HTTPException
-from fastapi.concurrency import run_in_threadpool
-from github import Github, GithubException
-from api.config.config import GITHUB_API_TOKEN, OPEN_ROUTER_API_KEY
+from api.config.config import (
+    GITHUB_API_TOKEN, OPEN_ROUTER_API_KEY, LLM_MODEL_NAME, VERIFY_WORKERS, VERIFY_MAX_QUEUE
+)
 from api.models.skill_verifier_models import VerificationResponse, RepoUrlRequest
 from api.utils.github_url_parser import _parse_github_url
+from api.utils.github_fetch import fetch_repo_code_context, get_head_sha
+from api.utils.verifier_utils import (
+    verification_cache_key, get_cached_verification, cache_verification, store_verification
+)
+from api.utils.lm_registry import LM_REGISTRY
+from api.utils.structured_output import generate_structured
+from api.utils.jobs import Job, JOB_STORE
+from api.utils.executors import EXECUTORS
+from api.utils.singleflight import SingleFlight
+from api.utils.shortlister_utils import invalidate_applicant_shortlists
 
 router = APIRouter()
 
+# Bump when the review prompt or context selection changes so cached reviews are not reused
+REVIEW_PROMPT_VERSION = "2"
+
 # -------------------------------
 # Environment + GitHub Setup
 # -------------------------------
+# Public repos still work without a token, at GitHub's much lower anonymous rate limit
 if not GITHUB_API_TOKEN:
-    raise EnvironmentError("GITHUB_API_TOKEN not found in .env file")
+    print("WARNING: GITHUB_API_TOKEN not set; GitHub requests are unauthenticated and heavily rate-limited.")
 
 if not OPEN_ROUTER_API_KEY:
     raise EnvironmentError("OPEN_ROUTER_API_KEY not found")
 
-g = Github(GITHUB_API_TOKEN)
-
 # ----------------------------------------------------------
 # DSPy Signature for AI Module
 # ----------------------------------------------------------
@@ -75,80 +86,84 @@ Only output valid JSON.
 
 
 # -------------------------------
-# Blocking GitHub + AI Task
+# GitHub + AI stages (each on its workload's executor)
 # -------------------------------
-def _verify_repo_blocking_tasks(repo_url: str) -> dict:
-    try:
-        # configuration of DSPy + OpenRouter
-        qwen_lm=dspy.LM(
-            api_key=OPEN_ROUTER_API_KEY,
-            model="openrouter/qwen/qwen3-14b:free",
-            api_base="https://openrouter.ai/api/v1"
+def _no_progress(stage: str):
+    pass
+
+
+def _review_code(code_context: str, report: Callable[[str], None] = _no_progress) -> dict:
+    """Blocking DSPy review of the packed code context; runs on the "llm" executor."""
+    full_prompt = _make_review_prompt(code_context)
+
+    def generate(feedback: Optional[str]) -> str:
+        report("reviewing")
+        raw = review_program(codebase=full_prompt + (feedback or "")).json_response
+        report("validating")
+        return raw
+
+    with LM_REGISTRY.context("skill_verifier"):
+        parsed = generate_structured(
+            generate,
+            VerificationResponse,
+            label="Skill verifier"
         )
-        dspy.configure(lm=qwen_lm)
+
+    return parsed.model_dump()
+
+
+async def _review_repo(
+    owner: str,
+    repo_name: str,
+    commit_sha: str,
+    cache_key: str,
+    report: Callable[[str], None] = _no_progress
+) -> dict:
+    # One archive download (or concurrent file fetches), ranked and packed into the token budget
+    report("fetching")
+    code_context, _ = await EXECUTORS.run("io", fetch_repo_code_context, owner, repo_name, ref=commit_sha)
+    if not code_context.strip():
+        raise HTTPException(400, "Repository is empty or unreadable.")
+
+    result = await EXECUTORS.run("llm", _review_code, code_context, report)
+    await EXECUTORS.run("io", cache_verification, cache_key, result)
+    return result
+
+
+# Concurrent verifications of the same repo@sha share one fetch + review
+REVIEW_FLIGHTS = SingleFlight("Skill verifier")
+
+
+async def _verify_repo(
+    repo_url: str,
+    applicant_id: Optional[str] = None,
+    report: Callable[[str], None] = _no_progress
+) -> dict:
+    try:
         owner, repo_name = _parse_github_url(repo_url)
-        repo = g.get_repo(f"{owner}/{repo_name}")
-
-        code_context = ""
-
-        metadata_files = [
-            "README.md", "requirements.txt", "package.json", "pom.xml", "build.gradle"
-        ]
-
-        for path in metadata_files:
-            try:
-                f = repo.get_contents(path)
-                content = base64.b64decode(f.content).decode("utf-8")
-                code_context += f"\n\n--- FILE: {path} ---\n{content}"
-            except GithubException:
-                pass
-
-        tree = repo.get_git_tree(repo.default_branch, recursive=True)
-        source_files = [
-            f.path for f in tree.tree
-            if f.type == "blob"
-            and f.path.endswith((".py", ".js", ".ts", ".java", ".go"))
-            and "node_modules" not in f.path
-            and ".venv" not in f.path
-        ]
-
-        priority = {"main.py", "app.py", "server.py", "index.py",
-                    "main.js", "app.js", "server.js", "index.js"}
-
-        priority_files = [p for p in source_files if os.path.basename(p) in priority]
-        other_files = [p for p in source_files if p not in priority_files]
-
-        selected = priority_files + other_files[:10 - len(priority_files)]
-
-        for fp in selected:
-            try:
-                f = repo.get_contents(fp)
-                content = base64.b64decode(f.content).decode("utf-8")
-                code_context += f"\n\n--- FILE: {fp} ---\n{content}"
-            except:
-                pass
-
-        if not code_context.strip():
-            raise HTTPException(400, "Repository is empty or unreadable.")
-
-        # -----------------------------
-        # DSPy Call
-        # -----------------------------
-        with dspy.context(lm=qwen_lm):
-            full_prompt = _make_review_prompt(code_context)
-            result = review_program(codebase=full_prompt)
-            print(result)
-            raw_json = result.json_response.strip()
-            parsed = json.loads(raw_json)
-
-            VerificationResponse(**parsed)  # Validate schema
-
-        return parsed
-
-    except json.JSONDecodeError:
-        raise HTTPException(500, "AI returned invalid JSON.")
-    except GithubException as e:
-        raise HTTPException(500, f"GitHub error: {str(e)}")
+
+        # A single HEAD lookup decides whether a previous review is still valid
+        commit_sha = await EXECUTORS.run("io", get_head_sha, owner, repo_name)
+        cache_key = verification_cache_key(owner, repo_name, commit_sha, REVIEW_PROMPT_VERSION, LLM_MODEL_NAME)
+
+        result = await EXECUTORS.run("io", get_cached_verification, cache_key)
+        if result is not None:
+            print(f"INFO: Verification cache hit for {owner}/{repo_name}@{commit_sha[:7]}.")
+        else:
+            if REVIEW_FLIGHTS.has(cache_key):
+                # Another request is already reviewing this commit; its stages are not ours to report
+                report("waiting-on-shared-review")
+            result = await REVIEW_FLIGHTS.do(
+                cache_key, lambda: _review_repo(owner, repo_name, commit_sha, cache_key, report)
+            )
+
+        if applicant_id:
+            await EXECUTORS.run("db", store_verification, applicant_id, repo_url, repo_name, result)
+            # Verified skills feed the shortlist score; rescore this applicant only
+            await EXECUTORS.run("db", invalidate_applicant_shortlists, applicant_id)
+
+        return result
+
     except Exception as e:
         if isinstance(e, HTTPException):
             raise e
@@ -156,8 +171,84 @@ def _verify_repo_blocking_tasks(repo_url: str) -> dict:
 
 
 # -------------------------------
-# API Endpoint
+# Bounded background execution
+# -------------------------------
+# At most VERIFY_WORKERS verifications run at once (their GitHub, LLM and DB calls
+# go to the shared executors); VERIFY_MAX_QUEUE caps queued + running work (inline and jobs).
+VERIFY_SLOTS = asyncio.Semaphore(VERIFY_WORKERS)
+VERIFY_PENDING = 0
+
+
+def _reserve_slot():
+    global VERIFY_PENDING
+    if VERIFY_PENDING >= VERIFY_MAX_QUEUE:
+        raise HTTPException(
+            status_code=429,
+            detail="Verification queue is full. Retry later.",
+            headers={"Retry-After": "30"}
+        )
+    VERIFY_PENDING += 1
+
+
+def _release_slot():
+    global VERIFY_PENDING
+    VERIFY_PENDING -= 1
+
+
+async def _run_verification(repo_url: str, applicant_id: Optional[str], report: Callable[[str], None] = _no_progress) -> dict:
+    async with VERIFY_SLOTS:
+        return await _verify_repo(repo_url, applicant_id, report)
+
+
+async def _run_verify_job(job: Job, req: RepoUrlRequest):
+    # The queue slot is released by the task's done-callback (see submit_skill_verification)
+    try:
+        result = await _run_verification(req.url, req.applicant_id, job.stage_reporter(asyncio.get_running_loop()))
+        await job.add_result({"url": req.url, "status": "ok", "data": result})
+        await job.finish()
+    except HTTPException as e:
+        await job.add_result({"url": req.url, "status": "error", "error": e.detail})
+        await job.finish(error=str(e.detail))
+    except Exception as e:
+        await job.add_result({"url": req.url, "status": "error", "error": str(e)})
+        await job.finish(error=str(e))
+
+
+# -------------------------------
+# API Endpoints
 # -------------------------------
 @router.post("/verify-repo", response_model=VerificationResponse)
 async def handle_skill_verification(req: RepoUrlRequest):
-    return await run_in_threadpool(_verify_repo_blocking_tasks, req.url)
+    _reserve_slot()
+    try:
+        return await _run_verification(req.url, req.applicant_id)
+    finally:
+        _release_slot()
+
+
+@router.post("/verify-repo/jobs", status_code=202)
+async def submit_skill_verification(req: RepoUrlRequest):
+    """
+    Queues a verification and returns a job id immediately. Poll
+    `/verify-repo/jobs/{job_id}` for the stage (fetching, reviewing, validating, or
+    waiting-on-shared-review when another request is reviewing the same commit) and result.
+    """
+    _reserve_slot()
+    try:
+        job = JOB_STORE.create("verify-repo", total=1)
+        job.task = asyncio.create_task(_run_verify_job(job, req))
+    except BaseException:
+        _release_slot()
+        raise
+    # Runs however the task ends, including cancellation before it ever started
+    job.task.add_done_callback(lambda _: _release_slot())
+    return job.summary()
+
+
+@router.get("/verify-repo/jobs/{job_id}")
+async def get_skill_verification_job(job_id: str):
+    job = JOB_STORE.get(job_id, kind="verify-repo")
+    summary = job.summary()
+    if job.results:
+        summary["result"] = job.results[0].get("data")
+    return summary
@@ -0,0 +1,199 @@
+import os
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from api.utils.tokens import estimate_tokens
+
+
+# -------------------------------------------------
+# Repository file ranking + token-budgeted context packing (skill verifier)
+# -------------------------------------------------
+METADATA_FILES = [
+    "README.md", "requirements.txt", "pyproject.toml", "package.json", "pom.xml",
+    "build.gradle", "go.mod", "Cargo.toml", "Dockerfile", "docker-compose.yml"
+]
+
+SOURCE_EXTENSIONS = {
+    ".py", ".js", ".jsx", ".ts", ".tsx", ".java", ".go", ".rs", ".rb",
+    ".php", ".cs", ".cpp", ".cc", ".c", ".h", ".kt", ".swift", ".dart"
+}
+
+ENTRYPOINT_FILES = {
+    "main.py", "app.py", "server.py", "index.py", "manage.py", "wsgi.py", "asgi.py",
+    "main.js", "app.js", "server.js", "index.js", "main.ts", "app.ts", "server.ts", "index.ts",
+    "main.go", "main.rs", "lib.rs", "Main.java", "Application.java", "Program.cs"
+}
+
+# Vendored, built or dependency directories never say anything about the author
+SKIP_DIRS = {
+    "node_modules", "vendor", "third_party", "external", "dist", "build", "out", "target",
+    ".venv", "venv", "env", "site-packages", "__pycache__", ".git", ".next", ".nuxt",
+    "coverage", "bower_components", "migrations", "generated", "static", "public"
+}
+SKIP_SUFFIXES = (".min.js", ".min.css", ".bundle.js", ".map", ".pb.go", "_pb2.py", ".d.ts")
+
+TEST_PATH_RE = re.compile(r"(?:^|/)(?:tests?|__tests__|spec)/|(?:^|/)test_[^/]+$|_test\.\w+$|\.(?:test|spec)\.\w+$")
+GENERATED_MARKERS = ("@generated", "do not edit", "auto-generated", "autogenerated", "generated by")
+
+# At most this many test files are packed; they show testing practice, not features
+MAX_TEST_FILES = 2
+
+# Definition-like lines kept when a file is sliced to its signatures
+SIGNATURE_RE = re.compile(
+    r"^\s*(?:"
+    r"@\w+|(?:async\s+)?def\s|class\s|"                                       # Python
+    r"(?:export\s+)?(?:default\s+)?(?:async\s+)?function\b|"                  # JS/TS
+    r"export\s|(?:const|let)\s+\w+\s*=\s*(?:async\s*)?\(?[\w\s,{}]*\)?\s*=>|"
+    r"interface\s|type\s+\w+|enum\s|"
+    r"func\s|"                                                                 # Go
+    r"(?:pub(?:\(\w+\))?\s+)?(?:fn|struct|trait|impl|mod)\s|"                 # Rust
+    r"(?:public|private|protected|internal|static|abstract|final|override)\s" # Java/C#/Kotlin
+    r")"
+)
+IMPORT_RE = re.compile(r"^\s*(?:import\s|from\s+\S+\s+import\s|#include\s|using\s|require\(|const\s+\w+\s*=\s*require\()")
+
+
+def _skipped(path: str) -> bool:
+    parts = path.split("/")
+    return any(part in SKIP_DIRS for part in parts[:-1]) or path.endswith(SKIP_SUFFIXES)
+
+
+def is_test_file(path: str) -> bool:
+    return bool(TEST_PATH_RE.search(path))
+
+
+def score_file(path: str, size: int, primary_ext: Optional[str]) -> Optional[float]:
+    """Relevance of a file for judging the author's skills; None means never include."""
+    if "/" not in path and path in METADATA_FILES:
+        return 1000.0 - METADATA_FILES.index(path)
+    if _skipped(path):
+        return None
+    ext = os.path.splitext(path)[1]
+    if ext not in SOURCE_EXTENSIONS:
+        return None
+
+    depth = path.count("/")
+    score = 10.0 - min(depth, 5)
+    if os.path.basename(path) in ENTRYPOINT_FILES:
+        score += 20
+    if ext == primary_ext:
+        score += 5
+    if is_test_file(path):
+        score -= 4
+    # Tiny files (stubs, __init__) and very large ones (data, generated) carry little signal
+    if size < 200:
+        score -= 6
+    elif size > 100_000:
+        score -= 8
+    elif 1_000 <= size <= 20_000:
+        score += 3
+    return score
+
+
+def rank_files(entries: Iterable[Tuple[str, int]], limit: int) -> List[str]:
+    """
+    Orders (path, size) entries by relevance: root metadata first, then entry
+    points, files in the repo's main language, shallow and mid-sized files.
+    Vendored/minified/non-source files are dropped and tests are capped.
+    """
+    entries = list(entries)
+    languages = Counter(
+        os.path.splitext(path)[1] for path, _ in entries
+        if os.path.splitext(path)[1] in SOURCE_EXTENSIONS and not _skipped(path)
+    )
+    primary_ext = languages.most_common(1)[0][0] if languages else None
+
+    scored = []
+    for path, size in entries:
+        score = score_file(path, size, primary_ext)
+        if score is not None:
+            scored.append((score, path))
+    scored.sort(key=lambda item: (-item[0], item[1]))
+
+    ranked, tests = [], 0
+    for _, path in scored:
+        if is_test_file(path):
+            if tests >= MAX_TEST_FILES:
+                continue
+            tests += 1
+        ranked.append(path)
+        if len(ranked) >= limit:
+            break
+    return ranked
+
+
+def is_machine_written(text: str) -> bool:
+    """Minified bundles and files marked as generated."""
+    lines = text.splitlines() or [""]
+    if len(text) > 2_000 and len(text) / len(lines) > 250:
+        return True
+    head = "\n".join(lines[:5]).lower()
+    return any(marker in head for marker in GENERATED_MARKERS)
+
+
+def slice_signatures(text: str) -> str:
+    """Keeps imports and definition lines (classes, functions, exported symbols)."""
+    kept, omitted = [], 0
+    for line in text.splitlines():
+        if IMPORT_RE.match(line) or SIGNATURE_RE.match(line):
+            if omitted:
+                kept.append(f"    ... ({omitted} lines omitted)")
+                omitted = 0
+            kept.append(line.rstrip())
+        else:
+            omitted += 1
+    if omitted:
+        kept.append(f"    ... ({omitted} lines omitted)")
+    return "\n".join(kept)
+
+
+def _truncate(text: str, tokens: int) -> str:
+    cut = text[:tokens * 4]
+    return cut[:cut.rfind("\n")] if "\n" in cut else cut
+
+
+def pack_context(files: Dict[str, str], per_file_budget: int, total_budget: int) -> Tuple[str, dict]:
+    """
+    Packs files (already in rank order) into "--- FILE: path ---" sections.
+    Files over `per_file_budget` are sliced to their signatures (then cut);
+    files stop being added once `total_budget` is spent.
+
+    Returns (context, report) where the report lists how each file used the budget.
+    """
+    parts, report_files = [], []
+    used = 0
+
+    for path, text in files.items():
+        if is_machine_written(text):
+            report_files.append({"path": path, "mode": "skipped", "reason": "minified/generated", "tokens": 0})
+            continue
+
+        remaining = total_budget - used
+        file_budget = min(per_file_budget, remaining)
+        body, mode = text, "full"
+        if estimate_tokens(body) > file_budget:
+            if os.path.splitext(path)[1] in SOURCE_EXTENSIONS:
+                body, mode = slice_signatures(text), "signatures"
+            if estimate_tokens(body) > file_budget:
+                body, mode = _truncate(body, file_budget), "truncated"
+
+        # Not worth including a sliver of a file
+        tokens = estimate_tokens(body)
+        if tokens == 0 or (mode == "truncated" and tokens < min(200, per_file_budget // 4)):
+            report_files.append({"path": path, "mode": "skipped", "reason": "total budget", "tokens": 0})
+            continue
+
+        parts.append(f"\n\n--- FILE: {path} ---\n{body}")
+        used += tokens
+        report_files.append({"path": path, "mode": mode, "tokens": tokens, "original_tokens": estimate_tokens(text)})
+
+    report = {
+        "total_budget": total_budget,
+        "per_file_budget": per_file_budget,
+        "used_tokens": used,
+        "files_included": sum(1 for f in report_files if f["mode"] != "skipped"),
+        "files_skipped": sum(1 for f in report_files if f["mode"] == "skipped"),
+        "files": report_files
+    }
+    return "".join(parts), report
@@ -0,0 +1,53 @@
+from types import SimpleNamespace
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from api.utils.resume_text import extract_and_prepare
+from api.utils.scoring import compute_score_components
+
+
+# -------------------------------------------------
+# Entry points for the "cpu" executor
+# -------------------------------------------------
+# With EXECUTOR_CPU_KIND=process each worker is a fresh spawned interpreter that
+# imports this module to unpickle the call. Keep it to the PDF and scoring code
+# (no DSPy, DB pool or caches) and pass plain data, not the Pydantic models.
+__all__ = ["extract_and_prepare", "scoring_payload", "score_components"]
+
+
+def scoring_payload(job: Any, applicants: List[Any]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Picks the fields `compute_score_components` reads off the job and applicant models."""
+    job_payload = {"required_skills": job.required_skills, "preferred_skills": job.preferred_skills}
+    applicant_payloads = [
+        {
+            "ocr_skills": a.ocr_skills,
+            "verified_skills": [(v.skill, v.mastery_level) for v in a.verified_skills_data],
+            "resume_embedding": a.resume_embedding,
+            "project_embedding": a.project_embedding,
+            "best_project_level": a.best_project_level,
+        }
+        for a in applicants
+    ]
+    return job_payload, applicant_payloads
+
+
+def score_components(
+    job: Dict[str, Any],
+    applicants: List[Dict[str, Any]],
+    job_embedding: List[float]
+) -> Dict[str, np.ndarray]:
+    """`compute_score_components` over the output of `scoring_payload`."""
+    applicant_views = [
+        SimpleNamespace(
+            ocr_skills=a["ocr_skills"],
+            verified_skills_data=[
+                SimpleNamespace(skill=skill, mastery_level=mastery) for skill, mastery in a["verified_skills"]
+            ],
+            resume_embedding=a["resume_embedding"],
+            project_embedding=a["project_embedding"],
+            best_project_level=a["best_project_level"],
+        )
+        for a in applicants
+    ]
+    return compute_score_components(SimpleNamespace(**job), applicant_views, job_embedding)
@@ -0,0 +1,139 @@
+import time
+import threading
+import psycopg2
+from contextlib import contextmanager
+from typing import Optional, Dict, Iterator
+from psycopg2.extras import DictCursor
+from psycopg2.pool import ThreadedConnectionPool
+from fastapi import HTTPException
+
+from api.config.config import (
+    DATABASE_URL, DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE, DB_POOL_TIMEOUT, DB_POOL_HEALTHCHECK_IDLE
+)
+
+
+# -------------------------------------------------
+# Application-level Postgres connection pool
+# -------------------------------------------------
+class DatabasePool:
+    """
+    Thread-safe psycopg2 pool shared by all routers.
+
+    Checkout blocks (up to `timeout` seconds) instead of failing when every
+    connection is in use, and connections idle for longer than
+    `healthcheck_idle` seconds are pinged before being handed out.
+    """
+
+    def __init__(self, dsn: str, min_size: int = 1, max_size: int = 10,
+                 timeout: float = 10.0, healthcheck_idle: float = 30.0):
+        self.timeout = timeout
+        self.healthcheck_idle = healthcheck_idle
+        self._pool = ThreadedConnectionPool(min_size, max_size, dsn, cursor_factory=DictCursor)
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._last_used: Dict[int, float] = {}
+
+    def _is_healthy(self, conn) -> bool:
+        if conn.closed:
+            return False
+        last_used = self._last_used.get(id(conn))
+        if last_used is None or time.monotonic() - last_used < self.healthcheck_idle:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _checkout(self):
+        # One retry with a fresh connection if the pooled one is dead
+        for _ in range(2):
+            conn = self._pool.getconn()
+            if self._is_healthy(conn):
+                return conn
+            self._last_used.pop(id(conn), None)
+            self._pool.putconn(conn, close=True)
+        return self._pool.getconn()
+
+    @contextmanager
+    def connection(self) -> Iterator:
+        """Checks out a connection; commits on success, rolls back on error, always returns it."""
+        if not self._slots.acquire(timeout=self.timeout):
+            raise HTTPException(status_code=503, detail="Database is busy. Please retry shortly.")
+
+        conn = None
+        try:
+            conn = self._checkout()
+            yield conn
+            conn.commit()
+        except Exception:
+            if conn is not None and not conn.closed:
+                conn.rollback()
+            raise
+        finally:
+            if conn is not None:
+                if conn.closed:
+                    self._last_used.pop(id(conn), None)
+                else:
+                    self._last_used[id(conn)] = time.monotonic()
+                self._pool.putconn(conn, close=bool(conn.closed))
+            self._slots.release()
+
+    def close(self) -> None:
+        self._pool.closeall()
+
+
+DB_POOL: Optional[DatabasePool] = None
+_DB_POOL_LOCK = threading.Lock()
+
+
+def _create_db_pool() -> DatabasePool:
+    """Builds the shared pool once; raises psycopg2.OperationalError if the DB is unreachable."""
+    global DB_POOL
+    with _DB_POOL_LOCK:
+        if DB_POOL is None:
+            DB_POOL = DatabasePool(
+                DATABASE_URL,
+                min_size=DB_POOL_MIN_SIZE,
+                max_size=DB_POOL_MAX_SIZE,
+                timeout=DB_POOL_TIMEOUT,
+                healthcheck_idle=DB_POOL_HEALTHCHECK_IDLE
+            )
+            print(f"INFO: Database pool ready ({DB_POOL_MIN_SIZE}-{DB_POOL_MAX_SIZE} connections).")
+        return DB_POOL
+
+
+def init_db_pool() -> None:
+    """
+    Creates the shared pool (called from the FastAPI lifespan). An unreachable
+    database does not stop startup: endpoints that need it retry on first use.
+    """
+    if not DATABASE_URL:
+        print("WARNING: DATABASE_URL is not set. Database-backed endpoints are disabled.")
+        return
+    try:
+        _create_db_pool()
+    except psycopg2.OperationalError as e:
+        print(f"WARNING: Database unreachable at startup ({str(e).strip()}); will retry on first use.")
+
+
+def close_db_pool() -> None:
+    global DB_POOL
+    if DB_POOL is not None:
+        DB_POOL.close()
+        DB_POOL = None
+
+
+@contextmanager
+def get_db_connection() -> Iterator:
+    """Context-managed checkout from the shared pool (DictCursor rows)."""
+    if not DATABASE_URL:
+        raise HTTPException(status_code=500, detail="Database configuration missing.")
+    try:
+        pool = DB_POOL or _create_db_pool()
+    except psycopg2.OperationalError as e:
+        print(f"ERROR: Database connection failed: {str(e).strip()}")
+        raise HTTPException(status_code=503, detail="Database is unavailable. Please retry shortly.")
+    with pool.connection() as conn:
+        yield conn
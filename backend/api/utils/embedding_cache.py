@@ -0,0 +1,104 @@
+import os
+import hashlib
+import sqlite3
+import threading
+import numpy as np
+from collections import OrderedDict
+from typing import List, Dict, Iterable, Optional
+
+
+# -------------------------------------------------
+# Two-tier embedding cache (in-process LRU + SQLite)
+# -------------------------------------------------
+class EmbeddingCache:
+    """
+    Caches embeddings keyed by sha256(model name + text).
+
+    Lookups hit a bounded in-process LRU first and fall back to a local SQLite
+    file where vectors are stored as float32 blobs. Safe to share across threads.
+    """
+
+    def __init__(self, model_name: str, db_path: Optional[str] = None, max_memory_items: int = 10000):
+        self.model_name = model_name
+        self.max_memory_items = max_memory_items
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        if db_path:
+            try:
+                directory = os.path.dirname(db_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._conn = sqlite3.connect(db_path, check_same_thread=False)
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS embeddings ("
+                    " key TEXT PRIMARY KEY, model TEXT NOT NULL, dim INTEGER NOT NULL, vector BLOB NOT NULL)"
+                )
+                self._conn.commit()
+            except (sqlite3.Error, OSError) as e:
+                print(f"WARNING: Embedding cache at {db_path} unavailable ({e}). Using memory only.")
+                self._conn = None
+
+    def key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\0{text}".encode("utf-8")).hexdigest()
+
+    def _remember(self, key: str, embedding: List[float]) -> None:
+        self._memory[key] = embedding
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    def get_many(self, texts: Iterable[str]) -> Dict[str, List[float]]:
+        """Returns {text: embedding} for every text found in either tier."""
+        keys = {self.key(text): text for text in texts}
+        found: Dict[str, List[float]] = {}
+
+        with self._lock:
+            for key, text in keys.items():
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[text] = self._memory[key]
+
+            missing = [key for key in keys if keys[key] not in found]
+            if self._conn is not None and missing:
+                # Stay well below SQLite's bound-parameter limit
+                for start in range(0, len(missing), 500):
+                    chunk = missing[start:start + 500]
+                    rows = self._conn.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})",
+                        chunk
+                    ).fetchall()
+                    for key, blob in rows:
+                        embedding = np.frombuffer(blob, dtype=np.float32).tolist()
+                        self._remember(key, embedding)
+                        found[keys[key]] = embedding
+
+        return found
+
+    def put_many(self, embeddings: Dict[str, List[float]]) -> None:
+        """Stores {text: embedding} in both tiers."""
+        if not embeddings:
+            return
+
+        rows = []
+        with self._lock:
+            for text, embedding in embeddings.items():
+                key = self.key(text)
+                self._remember(key, embedding)
+                vector = np.asarray(embedding, dtype=np.float32)
+                rows.append((key, self.model_name, int(vector.shape[0]), vector.tobytes()))
+
+            if self._conn is not None:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, model, dim, vector) VALUES (?, ?, ?, ?)",
+                    rows
+                )
+                self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,172 @@
+import time
+import random
+import asyncio
+import httpx
+import numpy as np
+from collections import deque
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import List, Optional, Dict, Any
+from fastapi import HTTPException
+
+from api.utils.embedding_providers import EmbeddingProvider
+
+RETRYABLE_STATUS_CODES = {429, 503}
+
+
+def _retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    """Parses a Retry-After header given either as seconds or as an HTTP date."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def _coerce_embeddings(data: Any, expected: int) -> List[List[float]]:
+    """
+    Normalizes the feature-extraction response into one vector per input.
+    Sentence models return (n, dim); token-level models return (n, tokens, dim),
+    which is mean-pooled. A single input may come back as a flat (dim,) vector.
+    """
+    array = np.asarray(data, dtype=np.float64)
+    if array.ndim == 1 and expected == 1:
+        array = array[np.newaxis, :]
+    elif array.ndim == 3:
+        array = array.mean(axis=1)
+
+    if array.ndim != 2 or array.shape[0] != expected:
+        raise ValueError(f"Unexpected embedding response shape {array.shape} for {expected} inputs.")
+    return array.tolist()
+
+
+# -------------------------------------------------
+# Batched Hugging Face feature-extraction client
+# -------------------------------------------------
+class HuggingFaceEmbeddingClient(EmbeddingProvider):
+    """
+    Async client for the Hugging Face feature-extraction API.
+
+    Packs texts into batched requests, caps in-flight requests with a semaphore,
+    retries 429/503 (and transport errors) with jittered exponential backoff that
+    honors Retry-After, and records per-batch latency.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        api_url: Optional[str] = None,
+        api_token: Optional[str] = None,
+        batch_size: int = 32,
+        max_concurrency: int = 4,
+        max_retries: int = 5,
+        base_backoff: float = 1.0,
+        max_backoff: float = 30.0,
+        timeout: float = 60.0,
+        dimension: int = 768,
+    ):
+        self.model_name = model_name
+        self.api_url = api_url or f"https://api-inference.huggingface.co/models/{model_name}"
+        self.batch_size = max(1, batch_size)
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.dimension = dimension
+        self.batch_latencies: deque = deque(maxlen=1000)
+
+        # Headers stay empty (free public endpoint) unless a token is configured
+        headers = {"Authorization": f"Bearer {api_token}"} if api_token else {}
+        self._client = httpx.AsyncClient(
+            timeout=timeout,
+            headers=headers,
+            limits=httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency),
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        if retry_after is not None:
+            return retry_after + random.uniform(0, self.base_backoff)
+        # Full jitter: uniform over [0, base * 2^attempt], capped
+        return random.uniform(0, min(self.max_backoff, self.base_backoff * (2 ** attempt)))
+
+    async def _post_batch(self, batch: List[str]) -> List[List[float]]:
+        payload = {"inputs": batch, "options": {"wait_for_model": True}}
+        attempt = 0
+        start = time.perf_counter()
+
+        async with self._semaphore:
+            while True:
+                try:
+                    response = await self._client.post(self.api_url, json=payload)
+                    if response.status_code in RETRYABLE_STATUS_CODES and attempt < self.max_retries:
+                        delay = self._backoff(attempt, _retry_after_seconds(response))
+                        print(f"WARNING: Embedding API returned {response.status_code}, retrying in {delay:.2f}s.")
+                        attempt += 1
+                        await asyncio.sleep(delay)
+                        continue
+
+                    response.raise_for_status()
+                    embeddings = _coerce_embeddings(response.json(), len(batch))
+                    break
+
+                except httpx.TransportError as e:
+                    if attempt >= self.max_retries:
+                        print(f"ERROR: Embedding API unreachable after {attempt + 1} attempts: {e}")
+                        raise HTTPException(status_code=502, detail="Embedding service is unreachable.")
+                    delay = self._backoff(attempt, None)
+                    print(f"WARNING: Embedding API transport error ({e}), retrying in {delay:.2f}s.")
+                    attempt += 1
+                    await asyncio.sleep(delay)
+
+                except httpx.HTTPStatusError as e:
+                    print(f"ERROR: Hugging Face API HTTP error: {e.response.text}")
+                    raise HTTPException(
+                        status_code=502,
+                        detail=f"Hugging Face API failed: {e.response.status_code} after {attempt + 1} attempts."
+                    )
+
+                except ValueError as e:
+                    print(f"ERROR: Invalid embedding response: {e}")
+                    raise HTTPException(status_code=502, detail="Embedding service returned an unexpected response.")
+
+        latency = time.perf_counter() - start
+        self.batch_latencies.append(latency)
+        print(f"INFO: Embedding batch of {len(batch)} texts took {latency * 1000:.0f} ms ({attempt + 1} attempts).")
+        return embeddings
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        """Returns one embedding per text. Empty texts map to a zero vector without a request."""
+        results: List[List[float]] = [[0.0] * self.dimension for _ in texts]
+        indexed = [(i, text) for i, text in enumerate(texts) if text]
+
+        batches = [indexed[start:start + self.batch_size] for start in range(0, len(indexed), self.batch_size)]
+        batch_results = await asyncio.gather(
+            *(self._post_batch([text for _, text in batch]) for batch in batches)
+        )
+
+        for batch, embeddings in zip(batches, batch_results):
+            for (i, _), embedding in zip(batch, embeddings):
+                results[i] = embedding
+        return results
+
+    def latency_summary(self) -> Dict[str, float]:
+        """p50/p95/max of recent batch latencies, in milliseconds."""
+        if not self.batch_latencies:
+            return {"batches": 0}
+        latencies = np.asarray(self.batch_latencies) * 1000
+        return {
+            "batches": len(latencies),
+            "p50_ms": float(np.percentile(latencies, 50)),
+            "p95_ms": float(np.percentile(latencies, 95)),
+            "max_ms": float(latencies.max()),
+        }
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
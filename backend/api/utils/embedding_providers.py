@@ -0,0 +1,91 @@
+import asyncio
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+
+# -------------------------------------------------
+# Embedding Provider Interface
+# -------------------------------------------------
+class EmbeddingProvider(ABC):
+    """
+    Common interface for embedding backends used by the shortlister.
+    `embed` is what gets passed as `embedding_function` to `get_shortlist_logic_hybrid`.
+    """
+    model_name: str
+    dimension: int
+
+    def load(self) -> None:
+        """Loads heavy resources once (called from the FastAPI lifespan)."""
+
+    @abstractmethod
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        """Returns one embedding per text, in order."""
+
+    async def aclose(self) -> None:
+        """Releases clients, pools or models."""
+
+
+# -------------------------------------------------
+# Local CPU backend (sentence-transformers)
+# -------------------------------------------------
+class LocalEmbeddingProvider(EmbeddingProvider):
+    """
+    Runs a sentence-transformers model in-process. Texts are encoded in batches on
+    a dedicated worker pool so inference never blocks the event loop, and
+    throughput is bound by local cores instead of a remote rate limit.
+    """
+
+    def __init__(self, model_name: str, batch_size: int = 32, max_workers: int = 1,
+                 device: str = "cpu", dimension: int = 768):
+        self.model_name = model_name
+        self.batch_size = max(1, batch_size)
+        self.device = device
+        self.dimension = dimension
+        self._max_workers = max_workers
+        self._model = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def load(self) -> None:
+        if self._model is not None:
+            return
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError:
+            raise RuntimeError(
+                "EMBEDDING_BACKEND=local requires the 'sentence-transformers' package."
+            )
+
+        self._model = SentenceTransformer(self.model_name, device=self.device)
+        self.dimension = self._model.get_sentence_embedding_dimension() or self.dimension
+        self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="embed")
+        print(f"INFO: Local embedding model {self.model_name} loaded on {self.device}.")
+
+    def _encode(self, batch: List[str]) -> List[List[float]]:
+        vectors = self._model.encode(batch, batch_size=self.batch_size, convert_to_numpy=True)
+        return vectors.tolist()
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        if self._model is None:
+            raise RuntimeError("Local embedding model is not loaded.")
+
+        results: List[List[float]] = [[0.0] * self.dimension for _ in texts]
+        indexed = [(i, text) for i, text in enumerate(texts) if text]
+        batches = [indexed[start:start + self.batch_size] for start in range(0, len(indexed), self.batch_size)]
+
+        loop = asyncio.get_running_loop()
+        batch_results = await asyncio.gather(*(
+            loop.run_in_executor(self._executor, self._encode, [text for _, text in batch])
+            for batch in batches
+        ))
+
+        for batch, embeddings in zip(batches, batch_results):
+            for (i, _), embedding in zip(batch, embeddings):
+                results[i] = embedding
+        return results
+
+    async def aclose(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._model = None
@@ -0,0 +1,172 @@
+import time
+import asyncio
+import contextvars
+import multiprocessing
+from functools import partial
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from api.config.config import (
+    EXECUTOR_CPU_KIND, EXECUTOR_CPU_WORKERS, EXECUTOR_IO_WORKERS, EXECUTOR_DB_WORKERS, EXECUTOR_LLM_WORKERS
+)
+
+
+# -------------------------------------------------
+# Named executors per workload class
+# -------------------------------------------------
+class BoundedExecutor:
+    """
+    A fixed-size pool for one class of blocking work, with saturation counters.
+
+    kind="thread" runs callables in worker threads (the caller's contextvars
+    are copied, as with Starlette's `run_in_threadpool`); kind="process" runs
+    them in worker processes, so callables and arguments must be picklable
+    module-level objects; where processes are unavailable (no /dev/shm on
+    serverless hosts) it falls back to threads. Counters are only touched on
+    the event loop thread.
+    """
+
+    def __init__(self, name: str, kind: str, max_workers: int):
+        self.name = name
+        self.kind = kind
+        self.max_workers = max(1, max_workers)
+        self._pool: Optional[Executor] = None
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.saturated = 0
+        self.busy_seconds = 0.0
+
+    def start(self) -> Executor:
+        if self._pool is None:
+            if self.kind == "process":
+                try:
+                    # "spawn": forking a process that already runs threads can copy held locks
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                    )
+                except (OSError, NotImplementedError) as e:
+                    self._fall_back_to_threads(e)
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"exec-{self.name}")
+        return self._pool
+
+    def _fall_back_to_threads(self, error: BaseException):
+        # Serverless runtimes (e.g. Vercel) have no /dev/shm for multiprocessing locks
+        print(f"WARNING: Process pool for '{self.name}' unavailable ({error}); using threads instead.")
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        self.kind = "thread"
+
+    def _submit(self, fn: Callable[..., Any], *args, **kwargs) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        pool = self.start()
+        call = partial(fn, *args, **kwargs)
+        if self.kind == "process":
+            try:
+                # Workers are spawned on submit, which can fail the same way as creating the pool
+                return loop.run_in_executor(pool, call)
+            except (OSError, NotImplementedError) as e:
+                self._fall_back_to_threads(e)
+                pool = self.start()
+        return loop.run_in_executor(pool, partial(contextvars.copy_context().run, call))
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        future = self._submit(fn, *args, **kwargs)
+        if self.in_flight >= self.max_workers:
+            self.saturated += 1
+        self.submitted += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        started = time.perf_counter()
+        try:
+            result = await future
+        except BaseException:
+            self.failed += 1
+            raise
+        else:
+            self.completed += 1
+            return result
+        finally:
+            self.in_flight -= 1
+            self.busy_seconds += time.perf_counter() - started
+
+    def stats(self) -> Dict[str, Any]:
+        finished = self.completed + self.failed
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "active": min(self.in_flight, self.max_workers),
+            "queued": max(0, self.in_flight - self.max_workers),
+            "peak_in_flight": self.peak_in_flight,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            # Submissions that found every worker busy and had to wait
+            "saturated": self.saturated,
+            "avg_latency_ms": round(1000 * self.busy_seconds / finished, 1) if finished else 0.0
+        }
+
+    def shutdown(self, wait: bool = True):
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+
+
+class ExecutorRegistry:
+    """
+    The application's executors by workload class, so a slow LLM cannot starve
+    PDF extraction or scoring. Pools start lazily, so scripts work without the
+    lifespan; `init_executors` starts them up front.
+    """
+
+    def __init__(self):
+        self._executors: Dict[str, BoundedExecutor] = {}
+
+    def register(self, executor: BoundedExecutor) -> BoundedExecutor:
+        self._executors[executor.name] = executor
+        return executor
+
+    def get(self, name: str) -> BoundedExecutor:
+        return self._executors[name]
+
+    async def run(self, name: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        return await self._executors[name].run(fn, *args, **kwargs)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: executor.stats() for name, executor in self._executors.items()}
+
+    def start(self):
+        for executor in self._executors.values():
+            executor.start()
+
+    def shutdown(self, wait: bool = True):
+        for executor in self._executors.values():
+            executor.shutdown(wait=wait)
+
+
+EXECUTORS = ExecutorRegistry()
+
+# cpu: PDF extraction + shortlist scoring; io: downloads, GitHub, local caches;
+# db: Postgres (sized to the connection pool); llm: blocking DSPy calls
+EXECUTORS.register(BoundedExecutor("cpu", EXECUTOR_CPU_KIND, EXECUTOR_CPU_WORKERS))
+EXECUTORS.register(BoundedExecutor("io", "thread", EXECUTOR_IO_WORKERS))
+EXECUTORS.register(BoundedExecutor("db", "thread", EXECUTOR_DB_WORKERS))
+EXECUTORS.register(BoundedExecutor("llm", "thread", EXECUTOR_LLM_WORKERS))
+
+
+def init_executors():
+    """Starts every pool. Called once from the application lifespan."""
+    EXECUTORS.start()
+    print("INFO: Executors ready: " + ", ".join(
+        f"{name}={stats['kind']}x{stats['max_workers']}" for name, stats in EXECUTORS.stats().items()
+    ) + ".")
+
+
+def close_executors():
+    # Queued calls are cancelled; running ones finish
+    EXECUTORS.shutdown(wait=True)
+    print("INFO: Executors shut down.")
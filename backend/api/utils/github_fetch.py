@@ -0,0 +1,159 @@
+import io
+import tarfile
+import requests
+from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+from fastapi import HTTPException
+from requests.adapters import HTTPAdapter
+
+from api.config.config import (
+    GITHUB_API_TOKEN, GITHUB_API_URL, GITHUB_FETCH_MODE, GITHUB_FETCH_CONCURRENCY,
+    GITHUB_TARBALL_MAX_BYTES, GITHUB_TIMEOUT, VERIFY_CONTEXT_TOKEN_BUDGET, VERIFY_FILE_TOKEN_BUDGET,
+    VERIFY_MAX_CANDIDATE_FILES
+)
+from api.utils.context_packer import rank_files, pack_context
+
+# Shared session: keep-alive connections to the GitHub API are reused across verifications
+GITHUB_SESSION = requests.Session()
+GITHUB_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=max(GITHUB_FETCH_CONCURRENCY, 10)))
+GITHUB_SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=max(GITHUB_FETCH_CONCURRENCY, 10)))
+GITHUB_SESSION.headers.update({"Accept": "application/vnd.github+json", "X-GitHub-Api-Version": "2022-11-28"})
+if GITHUB_API_TOKEN:
+    GITHUB_SESSION.headers["Authorization"] = f"Bearer {GITHUB_API_TOKEN}"
+
+class TarballTooLarge(Exception):
+    pass
+
+
+def _decode(data: bytes) -> Optional[str]:
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        return None
+
+
+def _api_get(path: str, **kwargs) -> requests.Response:
+    try:
+        r = GITHUB_SESSION.get(f"{GITHUB_API_URL}{path}", timeout=GITHUB_TIMEOUT, **kwargs)
+    except requests.RequestException as e:
+        raise HTTPException(502, f"GitHub error: {e}")
+    if r.status_code == 404:
+        raise HTTPException(404, "Repository not found or not accessible.")
+    if r.status_code >= 400:
+        raise HTTPException(502, f"GitHub error: {r.status_code} {r.reason}")
+    return r
+
+
+def get_head_sha(owner: str, repo: str, ref: str = "HEAD") -> str:
+    """Resolves `ref` (default branch HEAD by default) to a commit SHA with one small request."""
+    r = _api_get(
+        f"/repos/{owner}/{repo}/commits/{quote(ref)}",
+        headers={"Accept": "application/vnd.github.sha"}
+    )
+    return r.text.strip()
+
+
+# -------------------------------------------------
+# Strategy 1: one tarball download
+# -------------------------------------------------
+def fetch_via_tarball(owner: str, repo: str, ref: Optional[str] = None) -> Dict[str, str]:
+    """Downloads the repo archive in one request and reads the top-ranked files from it."""
+    suffix = f"/{ref}" if ref else ""
+    with _api_get(f"/repos/{owner}/{repo}/tarball{suffix}", stream=True) as r:
+        declared = r.headers.get("Content-Length")
+        if declared and declared.isdigit() and int(declared) > GITHUB_TARBALL_MAX_BYTES:
+            raise TarballTooLarge()
+        body = bytearray()
+        for chunk in r.iter_content(chunk_size=256 * 1024):
+            body.extend(chunk)
+            if len(body) > GITHUB_TARBALL_MAX_BYTES:
+                raise TarballTooLarge()
+
+    files = {}
+    with tarfile.open(fileobj=io.BytesIO(body), mode="r:gz") as archive:
+        # Member names are prefixed with "<owner>-<repo>-<sha>/"
+        members = {
+            m.name.split("/", 1)[1]: m
+            for m in archive.getmembers()
+            if m.isfile() and "/" in m.name
+        }
+        ranked = rank_files(((path, m.size) for path, m in members.items()), VERIFY_MAX_CANDIDATE_FILES)
+        for path in ranked:
+            text = _decode(archive.extractfile(members[path]).read())
+            if text is not None:
+                files[path] = text
+    return files
+
+
+# -------------------------------------------------
+# Strategy 2: tree listing + concurrent blob fetch
+# -------------------------------------------------
+def _fetch_raw_file(owner: str, repo: str, path: str, ref: str) -> Optional[str]:
+    try:
+        r = _api_get(
+            f"/repos/{owner}/{repo}/contents/{quote(path)}",
+            params={"ref": ref},
+            headers={"Accept": "application/vnd.github.raw"}
+        )
+    except HTTPException:
+        return None
+    return _decode(r.content)
+
+
+def fetch_via_blobs(owner: str, repo: str, ref: Optional[str] = None) -> Dict[str, str]:
+    """Lists the tree once, then fetches the top-ranked files on a bounded thread pool."""
+    if ref is None:
+        ref = _api_get(f"/repos/{owner}/{repo}").json()["default_branch"]
+    tree = _api_get(f"/repos/{owner}/{repo}/git/trees/{ref}", params={"recursive": "1"}).json()
+    entries = [
+        (entry["path"], entry.get("size", 0))
+        for entry in tree.get("tree", []) if entry.get("type") == "blob"
+    ]
+
+    selected = rank_files(entries, VERIFY_MAX_CANDIDATE_FILES)
+    with ThreadPoolExecutor(max_workers=GITHUB_FETCH_CONCURRENCY) as pool:
+        contents = pool.map(lambda p: _fetch_raw_file(owner, repo, p, ref), selected)
+        return {path: text for path, text in zip(selected, contents) if text is not None}
+
+
+# -------------------------------------------------
+# Entry point
+# -------------------------------------------------
+def fetch_repo_files(owner: str, repo: str, ref: Optional[str] = None, mode: str = GITHUB_FETCH_MODE) -> Dict[str, str]:
+    """
+    Returns {path: text} for the top-ranked files, in rank order.
+    mode: "tarball" (single archive request, falling back to blobs for huge
+    repos) or "blobs" (tree listing + concurrent file fetches).
+    """
+    if mode != "blobs":
+        try:
+            return fetch_via_tarball(owner, repo, ref)
+        except TarballTooLarge:
+            print(f"INFO: {owner}/{repo} archive exceeds {GITHUB_TARBALL_MAX_BYTES} bytes; fetching files individually.")
+        except tarfile.TarError as e:
+            print(f"WARNING: Could not read {owner}/{repo} archive ({e}); fetching files individually.")
+
+    return fetch_via_blobs(owner, repo, ref)
+
+
+def fetch_repo_code_context(
+    owner: str,
+    repo: str,
+    ref: Optional[str] = None,
+    mode: str = GITHUB_FETCH_MODE,
+    per_file_budget: int = VERIFY_FILE_TOKEN_BUDGET,
+    total_budget: int = VERIFY_CONTEXT_TOKEN_BUDGET
+) -> Tuple[str, dict]:
+    """
+    Returns the "--- FILE: path ---" code context for the verifier, packed into
+    the token budgets, plus a report of how the budget was used.
+    """
+    files = fetch_repo_files(owner, repo, ref, mode)
+    context, report = pack_context(files, per_file_budget, total_budget)
+    print(
+        f"INFO: Packed {owner}/{repo}: {report['used_tokens']}/{total_budget} tokens, "
+        f"{report['files_included']} files included, {report['files_skipped']} skipped "
+        f"({', '.join(f['path'] + ':' + f['mode'] for f in report['files'])})."
+    )
+    return context, report
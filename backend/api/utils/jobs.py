@@ -0,0 +1,137 @@
+import time
+import uuid
+import asyncio
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+from fastapi import HTTPException
+
+from api.config.config import JOB_RESULT_TTL
+
+
+# -------------------------------------------------
+# In-memory background job tracking
+# -------------------------------------------------
+class Job:
+    """
+    A unit of background work with an append-only list of item results.
+    Readers can follow `results` as they arrive via `stream()`.
+    """
+
+    def __init__(self, kind: str, total: int):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.total = total
+        self.status = "queued"
+        self.stage: Optional[str] = None
+        self.error: Optional[str] = None
+        self.results: List[Dict[str, Any]] = []
+        self.succeeded = 0
+        self.failed = 0
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Condition()
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    async def _notify(self):
+        async with self._changed:
+            self._changed.notify_all()
+
+    async def set_stage(self, stage: str):
+        self.status = "running"
+        self.stage = stage
+        await self._notify()
+
+    def stage_reporter(self, loop: asyncio.AbstractEventLoop) -> Callable[[str], None]:
+        """A callable that worker threads use to update the stage on the event loop."""
+        def report(stage: str):
+            asyncio.run_coroutine_threadsafe(self.set_stage(stage), loop)
+        return report
+
+    async def add_result(self, item: Dict[str, Any]):
+        self.status = "running"
+        self.results.append(item)
+        if item.get("status") == "ok":
+            self.succeeded += 1
+        else:
+            self.failed += 1
+        await self._notify()
+
+    async def finish(self, error: Optional[str] = None):
+        self.status = "failed" if error else "completed"
+        self.error = error
+        self.stage = None
+        self.finished_at = time.time()
+        await self._notify()
+
+    async def stream(self, start: int = 0) -> AsyncIterator[Dict[str, Any]]:
+        """Yields results from `start` onwards, waiting for new ones until the job finishes."""
+        index = start
+        while True:
+            while index < len(self.results):
+                yield self.results[index]
+                index += 1
+            if self.done:
+                return
+            async with self._changed:
+                await self._changed.wait_for(lambda: index < len(self.results) or self.done)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "stage": self.stage,
+            "total": self.total,
+            "completed": len(self.results),
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at
+        }
+
+
+class JobStore:
+    """Holds jobs in memory; finished jobs are dropped `ttl` seconds after completion."""
+
+    def __init__(self, ttl: float = JOB_RESULT_TTL):
+        self.ttl = ttl
+        self._jobs: Dict[str, Job] = {}
+
+    def _prune(self):
+        cutoff = time.time() - self.ttl
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def create(self, kind: str, total: int) -> Job:
+        self._prune()
+        job = Job(kind, total)
+        self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str, kind: Optional[str] = None) -> Job:
+        self._prune()
+        job = self._jobs.get(job_id)
+        if job is None or (kind is not None and job.kind != kind):
+            raise HTTPException(404, f"Job {job_id} not found.")
+        return job
+
+    def active(self, kind: Optional[str] = None) -> int:
+        return sum(1 for job in self._jobs.values() if not job.done and (kind is None or job.kind == kind))
+
+    async def cancel_all(self):
+        """Cancels running job tasks; called on application shutdown."""
+        tasks = [job.task for job in self._jobs.values() if job.task and not job.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+JOB_STORE = JobStore()
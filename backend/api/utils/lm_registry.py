@@ -0,0 +1,76 @@
+import dspy
+from typing import Dict
+from fastapi import HTTPException
+
+from api.config.config import (
+    OPEN_ROUTER_API_KEY, LLM_MODEL_NAME, LLM_API_BASE, LLM_NUM_RETRIES, SHORTLIST_LLM_TIMEOUT
+)
+
+
+# -------------------------------------------------
+# Shared DSPy language models
+# -------------------------------------------------
+class LMRegistry:
+    """
+    Named dspy.LM instances built once at startup and shared by every request.
+
+    A dspy.LM holds no per-call state, so one instance is safe to use from many
+    threadpool workers at once. Callers select it with `context(name)`, which
+    wraps `dspy.context` and only affects the current thread/task; nothing
+    mutates the global `dspy.settings`. Requests go through litellm's
+    process-wide HTTP client, so keep-alive connections are reused across calls.
+    """
+
+    def __init__(self):
+        self._lms: Dict[str, dspy.LM] = {}
+
+    def register(self, name: str, lm: dspy.LM) -> dspy.LM:
+        self._lms[name] = lm
+        return lm
+
+    def is_ready(self, name: str) -> bool:
+        return name in self._lms
+
+    def get(self, name: str) -> dspy.LM:
+        lm = self._lms.get(name)
+        if lm is None:
+            raise HTTPException(503, f"Language model '{name}' is not initialized.")
+        return lm
+
+    def context(self, name: str):
+        """Context manager that routes DSPy calls in this thread/task to the named LM."""
+        return dspy.context(lm=self.get(name))
+
+    def clear(self):
+        self._lms.clear()
+
+
+LM_REGISTRY = LMRegistry()
+
+# Roles served by the registry; they currently share one OpenRouter model
+LM_ROLES = ("resume_parser", "skill_verifier", "shortlister")
+
+
+def _build_lm(**kwargs) -> dspy.LM:
+    return dspy.LM(
+        model=LLM_MODEL_NAME,
+        api_key=OPEN_ROUTER_API_KEY,
+        api_base=LLM_API_BASE,
+        num_retries=LLM_NUM_RETRIES,
+        **kwargs
+    )
+
+
+def init_lm_registry():
+    """Builds the shared LMs. Called once from the application lifespan."""
+    lm = _build_lm()
+    for role in LM_ROLES:
+        LM_REGISTRY.register(role, lm)
+    # Per-request timeout on the HTTP call itself, so time queued for an "llm" worker does not count
+    LM_REGISTRY.register("shortlister", _build_lm(timeout=SHORTLIST_LLM_TIMEOUT))
+    print(f"INFO: LM registry initialized with {LLM_MODEL_NAME} for {', '.join(LM_ROLES)}.")
+
+
+def close_lm_registry():
+    LM_REGISTRY.clear()
+    print("INFO: LM registry cleared.")
@@ -1,11 +1,28 @@
-import os
+import io
 import re
-import tempfile
+import time
+import ctypes
 import requests
 import pdfplumber
+import pypdfium2 as pdfium
+import pypdfium2.raw as pdfium_c
 import docx
+from typing import List, Optional, Tuple
+from requests.adapters import HTTPAdapter
 from fastapi import HTTPException
 
+from api.config.config import (
+    RESUME_MAX_BYTES, RESUME_CONNECT_TIMEOUT, RESUME_READ_TIMEOUT, RESUME_DOWNLOAD_DEADLINE,
+    RESUME_MAX_PAGES, PDF_EXTRACTION_MODE, PDF_FAST_PATH_PAGES
+)
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Shared, pooled HTTP session (keep-alive across resume downloads)
+HTTP_SESSION = requests.Session()
+HTTP_SESSION.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20))
+HTTP_SESSION.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=20))
+
 
 # -------------------------------------------------
 # Google Drive URL Auto-Resolution
@@ -35,19 +52,60 @@ def resolve_gdrive_url(url: str) -> str:
 # -------------------------------------------------
 # Download file (PDF / DOCX)
 # -------------------------------------------------
-def download_file(url: str) -> bytes:
+def fetch_file(
+    url: str,
+    max_bytes: int = RESUME_MAX_BYTES,
+    etag: Optional[str] = None
+) -> Tuple[Optional[bytes], Optional[str]]:
+    """
+    Streams the file in chunks over the shared session. Rejects bodies larger
+    than `max_bytes` (413) and downloads that exceed the overall deadline (504).
+
+    Returns (content, etag). With a known `etag` the request is conditional and
+    content is None when the server answers 304 Not Modified.
+    """
     try:
         # auto-fix Google Drive links
         url = resolve_gdrive_url(url)
-
-        r = requests.get(url, allow_redirects=True)
-        r.raise_for_status()
-        return r.content
-
+        deadline = time.monotonic() + RESUME_DOWNLOAD_DEADLINE
+        headers = {"If-None-Match": etag} if etag else {}
+
+        with HTTP_SESSION.get(
+            url,
+            headers=headers,
+            allow_redirects=True,
+            stream=True,
+            timeout=(RESUME_CONNECT_TIMEOUT, RESUME_READ_TIMEOUT)
+        ) as r:
+            if etag and r.status_code == 304:
+                return None, etag
+            r.raise_for_status()
+
+            declared = r.headers.get("Content-Length")
+            if declared and declared.isdigit() and int(declared) > max_bytes:
+                raise HTTPException(413, f"File exceeds the {max_bytes // 1024} KB size limit.")
+
+            body = bytearray()
+            for chunk in r.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                body.extend(chunk)
+                if len(body) > max_bytes:
+                    raise HTTPException(413, f"File exceeds the {max_bytes // 1024} KB size limit.")
+                if time.monotonic() > deadline:
+                    raise HTTPException(504, "File download timed out.")
+
+            return bytes(body), r.headers.get("ETag")
+
+    except HTTPException:
+        raise
     except Exception:
         raise HTTPException(400, "Unable to download file")
 
 
+def download_file(url: str, max_bytes: int = RESUME_MAX_BYTES) -> bytes:
+    content, _ = fetch_file(url, max_bytes)
+    return content
+
+
 # -------------------------------------------------
 # File Type Detection
 # -------------------------------------------------
@@ -66,74 +124,100 @@ def detect_file_type(url: str) -> str:
 
 
 # -------------------------------------------------
-# Extract Raw Text
+# Single-pass PDF Extraction (text + hyperlinks)
 # -------------------------------------------------
-def extract_text(file_path: str, file_type: str) -> str:
-    text = ""
-    try:
-        if file_type == "pdf":
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    text += (page.extract_text() or "") + "\n"
-
-        elif file_type == "docx":
-            doc = docx.Document(file_path)
-            for para in doc.paragraphs:
-                text += para.text + "\n"
+def _extract_pdf_pdfplumber(source, max_pages: Optional[int]) -> Tuple[List[str], List[str]]:
+    pages, links = [], []
+    with pdfplumber.open(source) as pdf:
+        for page in pdf.pages[:max_pages]:
+            pages.append(page.extract_text() or "")
+            for annot in page.annots or []:
+                uri = annot.get("uri")
+                if uri:
+                    links.append(uri)
+    return pages, links
+
+
+def _pdfium_page_links(document: pdfium.PdfDocument, page: pdfium.PdfPage) -> List[str]:
+    links = []
+    position = ctypes.c_int(0)
+    link = pdfium_c.FPDF_LINK()
+    while pdfium_c.FPDFLink_Enumerate(page.raw, ctypes.byref(position), ctypes.byref(link)):
+        action = pdfium_c.FPDFLink_GetAction(link)
+        if not action or pdfium_c.FPDFAction_GetType(action) != pdfium_c.PDFACTION_URI:
+            continue
+        size = pdfium_c.FPDFAction_GetURIPath(document.raw, action, None, 0)
+        buffer = ctypes.create_string_buffer(size)
+        pdfium_c.FPDFAction_GetURIPath(document.raw, action, buffer, size)
+        if buffer.value:
+            links.append(buffer.value.decode("utf-8", errors="ignore"))
+    return links
 
-    except Exception:
-        return ""
 
-    return text
+def _extract_pdf_pdfium(document: pdfium.PdfDocument, max_pages: Optional[int]) -> Tuple[List[str], List[str]]:
+    pages, links = [], []
+    for index in range(min(len(document), max_pages or len(document))):
+        page = document[index]
+        textpage = page.get_textpage()
+        try:
+            pages.append(textpage.get_text_range().replace("\r\n", "\n"))
+            links.extend(_pdfium_page_links(document, page))
+        finally:
+            textpage.close()
+            page.close()
+    return pages, links
+
+
+def extract_pdf(
+    content: bytes,
+    max_pages: Optional[int] = RESUME_MAX_PAGES,
+    mode: str = PDF_EXTRACTION_MODE
+) -> Tuple[List[str], List[str]]:
+    """
+    Walks each PDF page once and returns (page_texts, link_uris).
+
+    `mode` is "accurate" (pdfplumber layout-aware text), "fast" (pdfium, much
+    cheaper on long documents) or "auto" (fast only above PDF_FAST_PATH_PAGES pages).
+    Only the first `max_pages` pages are read (None reads everything).
+    """
+    max_pages = max_pages or None
+    if mode == "accurate":
+        return _extract_pdf_pdfplumber(io.BytesIO(content), max_pages)
+
+    document = pdfium.PdfDocument(content)
+    try:
+        if mode == "fast" or len(document) > PDF_FAST_PATH_PAGES:
+            return _extract_pdf_pdfium(document, max_pages)
+    finally:
+        document.close()
+    return _extract_pdf_pdfplumber(io.BytesIO(content), max_pages)
 
 
 # -------------------------------------------------
-# Extract PDF Hyperlinks
+# Extract text, pages and links from downloaded bytes
 # -------------------------------------------------
-def extract_pdf_links(file_path: str):
+def extract_from_bytes(content: bytes, file_type: str) -> dict:
     links = []
     try:
-        with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                if not page.annots:
-                    continue
-                for annot in page.annots:
-                    uri = annot.get("uri")
-                    if uri:
-                        links.append(uri)
+        if file_type == "pdf":
+            # One pass over the pages yields both text and hyperlinks
+            pages, links = extract_pdf(content)
+            raw_text = "".join(f"{page}\n" for page in pages)
+        elif file_type == "docx":
+            doc = docx.Document(io.BytesIO(content))
+            raw_text = "".join(f"{para.text}\n" for para in doc.paragraphs)
+            pages = [raw_text]
+        else:
+            raw_text = ""
     except Exception:
-        pass
-    return links
-
-
-# -------------------------------------------------
-# Main Utility — unified return
-# -------------------------------------------------
-def load_and_extract(url: str) -> dict:
-    url = resolve_gdrive_url(url)
-    file_type = detect_file_type(url)
-    temp_path = None
-
-    try:
-        content = download_file(url)
-
-        suffix = f".{file_type}"
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-            tmp.write(content)
-            temp_path = tmp.name
+        raw_text = ""
 
-        raw_text = extract_text(temp_path, file_type)
-        if not raw_text.strip():
-            raise HTTPException(400, "Failed to extract text from file.")
+    if not raw_text.strip():
+        raise HTTPException(400, "Failed to extract text from file.")
 
-        links = extract_pdf_links(temp_path) if file_type == "pdf" else []
-
-        return {
-            "raw_text": raw_text,
-            "links": links,
-            "file_type": file_type,
-        }
-
-    finally:
-        if temp_path and os.path.exists(temp_path):
-            os.unlink(temp_path)
+    return {
+        "raw_text": raw_text,
+        "pages": pages,
+        "links": links,
+        "file_type": file_type,
+    }
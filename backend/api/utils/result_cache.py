@@ -0,0 +1,179 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+
+
+# -------------------------------------------------
+# Pluggable key/value result caches (TTL + LRU)
+# -------------------------------------------------
+class CacheBackend(ABC):
+    """JSON-serializable values with per-entry TTL and LRU eviction beyond `max_items`."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """Returns the value, or None if missing or expired."""
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Stores a value; `ttl` seconds (None = backend default, 0 = never expires)."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Removes a key if present."""
+
+    def close(self) -> None:
+        """Releases resources held by the backend."""
+
+
+class MemoryCacheBackend(CacheBackend):
+    def __init__(self, max_items: int = 1000, default_ttl: float = 0):
+        self.max_items = max_items
+        self.default_ttl = default_ttl
+        self._items: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _expiry(self, ttl: Optional[float]) -> float:
+        ttl = self.default_ttl if ttl is None else ttl
+        return time.time() + ttl if ttl else 0.0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at and expires_at < time.time():
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        with self._lock:
+            self._items[key] = (self._expiry(ttl), value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._items.pop(key, None)
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """Persistent backend: values stored as JSON in a local SQLite file."""
+
+    def __init__(self, path: str, max_items: int = 10000, default_ttl: float = 0):
+        self.max_items = max_items
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed_at ON cache (accessed_at)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, expires_at FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if expires_at and expires_at < now:
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        return json.loads(value)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        now = time.time()
+        ttl = self.default_ttl if ttl is None else ttl
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now + ttl if ttl else 0.0, now)
+            )
+            # Evict least recently used entries beyond the limit
+            self._conn.execute(
+                "DELETE FROM cache WHERE key IN ("
+                " SELECT key FROM cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_items,)
+            )
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class LazyCacheBackend(CacheBackend):
+    """
+    Builds the real backend on first use, so importing a module that declares a
+    cache never touches the filesystem.
+    """
+
+    def __init__(self, factory: Callable[[], CacheBackend]):
+        self._factory = factory
+        self._backend: Optional[CacheBackend] = None
+        self._lock = threading.Lock()
+
+    def _resolve(self) -> CacheBackend:
+        if self._backend is None:
+            with self._lock:
+                if self._backend is None:
+                    self._backend = self._factory()
+        return self._backend
+
+    def get(self, key: str) -> Optional[Any]:
+        return self._resolve().get(key)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self._resolve().set(key, value, ttl)
+
+    def delete(self, key: str) -> None:
+        self._resolve().delete(key)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._backend is not None:
+                self._backend.close()
+                self._backend = None
+
+
+def _build_cache_backend(kind: str, path: Optional[str], max_items: int, default_ttl: float) -> CacheBackend:
+    if kind == "sqlite" and path:
+        try:
+            return SQLiteCacheBackend(path, max_items=max_items, default_ttl=default_ttl)
+        except (sqlite3.Error, OSError) as e:
+            # e.g. a read-only filesystem on serverless hosts
+            print(f"WARNING: SQLite cache at {path} unavailable ({e}). Using memory only.")
+    return MemoryCacheBackend(max_items=max_items, default_ttl=default_ttl)
+
+
+def create_cache_backend(kind: str, path: Optional[str] = None,
+                         max_items: int = 1000, default_ttl: float = 0) -> CacheBackend:
+    """
+    Builds a backend from config ("memory" or "sqlite"), lazily on first use;
+    falls back to memory if the SQLite file cannot be created or opened.
+    """
+    return LazyCacheBackend(lambda: _build_cache_backend(kind, path, max_items, default_ttl))
@@ -0,0 +1,203 @@
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# -------------------------------------------------
+# Deterministic resume field extraction (no LLM)
+# -------------------------------------------------
+EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+PHONE_RE = re.compile(r"(?<![\w+(])(\+?\(?\d[\d\s().-]{8,16}\d)(?!\w)")
+GITHUB_RE = re.compile(r"(?:https?://)?(?:www\.)?github\.com/[A-Za-z0-9](?:[A-Za-z0-9-]{0,38})(?:/[\w.-]+)?", re.IGNORECASE)
+LINKEDIN_RE = re.compile(r"(?:https?://)?(?:[a-z]{2,3}\.)?linkedin\.com/in/[\w%-]+/?", re.IGNORECASE)
+CGPA_RE = re.compile(
+    r"\b(?:c\.?g\.?p\.?a|s\.?g\.?p\.?a|g\.?p\.?a|cpi)\b\s*(?:[:\-=]|of|is)?\s*"
+    r"(\d{1,2}(?:\.\d{1,2})?)(?:\s*/\s*(\d{1,2}(?:\.\d{1,2})?))?",
+    re.IGNORECASE
+)
+# "8.7/10 CGPA" (score before the label)
+CGPA_SUFFIX_RE = re.compile(
+    r"(\d{1,2}(?:\.\d{1,2})?)\s*/\s*(\d{1,2}(?:\.\d{1,2})?)\s*(?:c\.?g\.?p\.?a|g\.?p\.?a|cpi)\b",
+    re.IGNORECASE
+)
+
+# Canonical skill name -> extra spellings (the lowercase canonical name is matched too,
+# unless it is an everyday word listed in AMBIGUOUS_TERMS).
+SKILL_VOCABULARY: Dict[str, List[str]] = {
+    "Python": [], "Java": [], "JavaScript": ["js", "java script"], "TypeScript": ["ts"],
+    "C++": ["cpp"], "C#": ["c sharp", "csharp"], "Go": ["golang"], "Rust": [], "Kotlin": [],
+    "Swift": [], "Ruby": [], "PHP": [], "Scala": [], "Dart": [], "R Programming": ["rstudio"],
+    "SQL": [], "MySQL": [], "PostgreSQL": ["postgres"], "MongoDB": ["mongo db"], "SQLite": [],
+    "Redis": [], "Firebase": [], "Supabase": [], "Prisma": [],
+    "HTML": ["html5"], "CSS": ["css3"], "Tailwind CSS": ["tailwind", "tailwindcss"], "Bootstrap": [],
+    "React": ["react.js", "reactjs"], "Next.js": ["nextjs", "next js"], "Angular": ["angularjs"],
+    "Vue.js": ["vue", "vuejs"], "Node.js": ["nodejs", "node js"], "Express.js": ["expressjs", "express.js"],
+    "Redux": [], "GraphQL": [], "REST API": ["rest apis", "restful"],
+    "Django": [], "Flask": [], "FastAPI": ["fast api"], "Spring Boot": ["springboot"],
+    "Flutter": [], "React Native": [], "Android": [],
+    "Machine Learning": ["ml"], "Deep Learning": [], "NLP": ["natural language processing"],
+    "Computer Vision": ["opencv"], "TensorFlow": [], "PyTorch": [], "Keras": [], "scikit-learn": ["sklearn"],
+    "Pandas": [], "NumPy": [], "Matplotlib": [], "LLM": ["llms", "large language models"], "LangChain": [],
+    "Data Structures": ["dsa", "data structures and algorithms"], "Algorithms": [],
+    "Git": [], "GitHub": [], "Docker": [], "Kubernetes": ["k8s"], "Linux": [], "Bash": ["shell scripting"],
+    "AWS": ["amazon web services"], "GCP": ["google cloud"], "Azure": [], "CI/CD": ["ci cd"],
+    "Jenkins": [], "Terraform": [], "Figma": [], "Tableau": [], "Power BI": ["powerbi"],
+    "Excel": ["ms excel", "microsoft excel"],
+}
+
+AMBIGUOUS_TERMS = {"go", "excel"}
+
+
+def _joins(text: str, index: int, step: int) -> bool:
+    """
+    True if the character at `index` continues the token a hit sits in: a word
+    character, or ".", "/", "-" or "@" followed (in `step` direction) by one, as in
+    "node.js", "github.com/x" or "ci-cd". "+"/"#" after a hit continue it too ("c++").
+    """
+    if index < 0 or index >= len(text):
+        return False
+    ch = text[index]
+    if ch.isalnum() or ch == "_":
+        return True
+    if step > 0 and ch in "+#":
+        return True
+    if ch in "./-@":
+        beyond = index + step
+        return 0 <= beyond < len(text) and text[beyond].isalnum()
+    return False
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over lowercase skill spellings. One pass over the
+    text finds every dictionary hit; hits must sit on word boundaries on both
+    sides, so "js" in "node.js" or "github" in "github.com/..." do not count.
+    """
+
+    def __init__(self, vocabulary: Dict[str, Iterable[str]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, str]]] = [[]]
+
+        for canonical, aliases in vocabulary.items():
+            for term in {canonical.lower(), *(alias.lower() for alias in aliases)} - AMBIGUOUS_TERMS:
+                self._add(term, canonical)
+        self._build_failure_links()
+
+    def _add(self, term: str, canonical: str):
+        node = 0
+        for ch in term:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append((len(term), canonical))
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0) if self._goto[fail].get(ch, 0) != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> List[str]:
+        """Canonical skills found in `text`, in order of first appearance."""
+        text = text.lower()
+        found: Dict[str, None] = {}
+        node = 0
+        for end, ch in enumerate(text):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            for length, canonical in self._out[node]:
+                start = end - length + 1
+                if canonical in found:
+                    continue
+                if not (_joins(text, start - 1, -1) or _joins(text, end + 1, 1)):
+                    found[canonical] = None
+        return list(found)
+
+
+SKILL_MATCHER = SkillMatcher(SKILL_VOCABULARY)
+
+
+def _first_phone(text: str) -> Optional[str]:
+    for match in PHONE_RE.finditer(text):
+        candidate = match.group(1).strip()
+        digits = re.sub(r"\D", "", candidate)
+        # Skip year ranges ("2019 - 2023") and other short digit runs
+        if 10 <= len(digits) <= 13 and not re.fullmatch(r"(?:19|20)\d{2}\D+(?:19|20)\d{2}", candidate):
+            return candidate
+    return None
+
+
+def _first_cgpa(text: str) -> Optional[str]:
+    for regex in (CGPA_RE, CGPA_SUFFIX_RE):
+        match = regex.search(text)
+        if match:
+            score, scale = match.group(1), match.group(2)
+            if float(score) <= float(scale or 10):
+                return f"{score}/{scale}" if scale else score
+    return None
+
+
+def _first_link(regex: re.Pattern, text: str, links: List[str]) -> Optional[str]:
+    for candidate in [*links, text]:
+        match = regex.search(candidate)
+        if match:
+            url = match.group(0).rstrip("/.")
+            return url if url.lower().startswith("http") else f"https://{url}"
+    return None
+
+
+def guess_name(text: str) -> Optional[str]:
+    """Best-effort name: the first short, letters-only line near the top."""
+    for line in text.splitlines()[:5]:
+        line = line.split("|")[0].strip()
+        words = line.split()
+        if 2 <= len(words) <= 4 and all(re.fullmatch(r"[A-Za-z][A-Za-z.'-]*", w) for w in words):
+            return line.title() if line.isupper() else line
+    return None
+
+
+def extract_rule_fields(text: str, links: List[str]) -> dict:
+    """
+    Fields that regex/dictionary lookup can fill deterministically. Keys are
+    only present when a value was found, so callers can ask the LLM for the rest.
+    """
+    fields = {}
+
+    email = EMAIL_RE.search(text)
+    if email:
+        fields["email"] = email.group(0)
+
+    phone = _first_phone(text)
+    if phone:
+        fields["phone"] = phone
+
+    cgpa = _first_cgpa(text)
+    if cgpa:
+        fields["cgpa"] = cgpa
+
+    skills = SKILL_MATCHER.find(text)
+    if skills:
+        fields["skills"] = skills
+
+    github = _first_link(GITHUB_RE, text, links)
+    if github:
+        fields["githubLink"] = github
+
+    linkedin = _first_link(LINKEDIN_RE, text, links)
+    if linkedin:
+        fields["linkedInLink"] = linkedin
+
+    return fields
@@ -0,0 +1,187 @@
+import re
+import math
+import unicodedata
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from api.utils.tokens import estimate_tokens
+from api.utils.pdf_utils import extract_from_bytes
+from api.utils.resume_rules import extract_rule_fields
+
+
+# -------------------------------------------------
+# Resume text preprocessing (before LLM parsing)
+# -------------------------------------------------
+# Section headings we recognise, in budget priority order. Lines before the
+# first heading are treated as the contact block.
+SECTION_PRIORITY = [
+    "contact", "education", "skills", "experience", "projects",
+    "certifications", "achievements", "other"
+]
+
+SECTION_HEADINGS = {
+    "education": r"education|academic (?:details|background|qualifications?)|qualifications?",
+    "skills": r"(?:technical |key |core )?skills|technolog(?:y|ies)|tech stack|tools",
+    "experience": r"(?:work |professional )?experience|employment(?: history)?|work history|internships?",
+    "projects": r"(?:academic |personal |key )?projects?",
+    "certifications": r"certifications?|courses|trainings?",
+    "achievements": r"achievements|awards|honou?rs|accomplishments",
+    "other": r"summary|objective|profile|about me|interests|hobbies|languages|activities|extra[- ]?curricular.*|references|declaration|positions? of responsibility|volunteering",
+}
+
+_HEADING_RE = {
+    section: re.compile(rf"^(?:{pattern})\s*:?$", re.IGNORECASE)
+    for section, pattern in SECTION_HEADINGS.items()
+}
+
+# Lines this close to the top/bottom of a page are header/footer candidates
+EDGE_LINES = 3
+# "Page 2", "Page 2/3", "2 of 3" or a bare short number ("2", "- 2 -"). Only ever applied
+# to a page's first/last line: elsewhere a lone "2023" or "9/10" is a year or a CGPA.
+_PAGE_NUMBER_RE = re.compile(
+    r"^(?:page\s*\d+(?:\s*(?:/|of)\s*\d+)?|\d+\s*of\s*\d+|-?\s*\d{1,3}\s*-?)$", re.IGNORECASE
+)
+
+
+def normalize_line(line: str) -> str:
+    line = unicodedata.normalize("NFKC", line)
+    return re.sub(r"\s+", " ", line).strip()
+
+
+def _edge_key(line: str) -> str:
+    # Page numbers and dates vary between pages; compare headers without digits
+    return re.sub(r"\d+", "#", line.casefold())
+
+
+def _is_page_number(page: List[str], i: int) -> bool:
+    return (i == 0 or i == len(page) - 1) and bool(_PAGE_NUMBER_RE.match(page[i]))
+
+
+def remove_repeated_edges(pages: List[List[str]]) -> List[List[str]]:
+    """
+    Drops page numbers (first/last line of a page) and lines repeated at the
+    top/bottom of most pages. The first page keeps its copy, since running
+    headers usually carry the name. Repeats in the body are left alone.
+    """
+    if len(pages) < 2:
+        return [[line for i, line in enumerate(page) if not _is_page_number(page, i)] for page in pages]
+
+    counts = Counter()
+    for page in pages:
+        edges = {_edge_key(line) for line in page[:EDGE_LINES] + page[-EDGE_LINES:]}
+        counts.update(edges)
+    threshold = max(2, math.ceil(len(pages) / 2))
+    repeated = {key for key, count in counts.items() if count >= threshold}
+
+    cleaned = []
+    for page_index, page in enumerate(pages):
+        n = len(page)
+        cleaned.append([
+            line for i, line in enumerate(page)
+            if not _is_page_number(page, i)
+            and not (
+                page_index > 0
+                and (i < EDGE_LINES or i >= n - EDGE_LINES)
+                and _edge_key(line) in repeated
+            )
+        ])
+    return cleaned
+
+
+def _heading_section(line: str) -> Optional[str]:
+    if len(line) > 40:
+        return None
+    for section, pattern in _HEADING_RE.items():
+        if pattern.match(line):
+            return section
+    return None
+
+
+def split_sections(lines: List[str]) -> List[Tuple[str, List[str]]]:
+    """Splits lines into (section, lines) blocks in document order."""
+    blocks: List[Tuple[str, List[str]]] = [("contact", [])]
+    for line in lines:
+        section = _heading_section(line)
+        if section is not None:
+            blocks.append((section, [line]))
+        else:
+            blocks[-1][1].append(line)
+    return [(section, block) for section, block in blocks if block]
+
+
+def apply_token_budget(blocks: List[Tuple[str, List[str]]], budget: int) -> Tuple[List[str], bool]:
+    """
+    Keeps whole sections in SECTION_PRIORITY order while they fit; the first
+    section that does not fit is cut line by line. Kept lines stay in document order.
+    """
+    order = sorted(range(len(blocks)), key=lambda i: SECTION_PRIORITY.index(blocks[i][0]))
+    kept: Dict[int, List[str]] = {}
+    remaining = budget
+    truncated = False
+
+    for i in order:
+        lines = blocks[i][1]
+        cost = sum(estimate_tokens(line) + 1 for line in lines)
+        if cost <= remaining:
+            kept[i] = lines
+            remaining -= cost
+            continue
+
+        truncated = True
+        partial = []
+        for line in lines:
+            line_cost = estimate_tokens(line) + 1
+            if line_cost > remaining:
+                break
+            partial.append(line)
+            remaining -= line_cost
+        if partial:
+            kept[i] = partial
+        break
+
+    return [line for i in sorted(kept) for line in kept[i]], truncated
+
+
+def preprocess_resume_text(pages: List[str], token_budget: int) -> dict:
+    """
+    Normalizes whitespace, strips page numbers and repeated page headers/footers
+    and fits the text into `token_budget` estimated tokens.
+    Returns the prepared text with before/after token counts.
+    """
+    original = "".join(f"{page}\n" for page in pages)
+    page_lines = [
+        [line for line in (normalize_line(raw) for raw in page.splitlines()) if line]
+        for page in pages
+    ]
+
+    lines = [line for page in remove_repeated_edges(page_lines) for line in page]
+    truncated = False
+    if token_budget and sum(estimate_tokens(line) + 1 for line in lines) > token_budget:
+        lines, truncated = apply_token_budget(split_sections(lines), token_budget)
+
+    text = "\n".join(lines)
+    original_tokens = estimate_tokens(original)
+    tokens = estimate_tokens(text)
+    return {
+        "text": text,
+        "original_tokens": original_tokens,
+        "tokens": tokens,
+        "tokens_saved": max(0, original_tokens - tokens),
+        "truncated": truncated
+    }
+
+
+def extract_and_prepare(content: bytes, file_type: str, token_budget: int) -> dict:
+    """
+    Extracts text/links, then builds the cleaned, token-budgeted text for the LLM
+    and the rule-based fields. CPU-bound and picklable, so it runs on the "cpu" executor.
+    """
+    result = extract_from_bytes(content, file_type)
+    prepared = preprocess_resume_text(result["pages"], token_budget)
+    print(
+        f"INFO: Resume text {prepared['original_tokens']} -> {prepared['tokens']} tokens "
+        f"({prepared['tokens_saved']} saved{', truncated' if prepared['truncated'] else ''})."
+    )
+    result["llm_text"] = prepared["text"]
+    result["rule_fields"] = extract_rule_fields(result["raw_text"], result["links"])
+    return result
@@ -0,0 +1,158 @@
+import re
+import numpy as np
+from scipy import sparse
+from typing import TYPE_CHECKING, Dict, List
+
+if TYPE_CHECKING:
+    from api.models.shortlister_models import JobDetails, ApplicantProfile
+
+
+# -------------------------------------------------
+# Vectorized score components
+# -------------------------------------------------
+# Only numpy/scipy here: this module is imported by the "cpu" executor's worker
+# processes (see api.utils.cpu_tasks), which must not load DSPy or the DB pool.
+PROJECT_LEVEL_SCORES = {"Beginner": 30, "Intermediate": 60, "Advanced": 90}
+MAX_SKILL_MASTERY = 10.0 # Assuming mastery level is out of 10
+
+
+def normalize_skill(skill: str) -> str:
+    """Standardizes a skill name for reliable comparison."""
+    skill_lower = skill.lower().strip()
+    skill_lower = re.sub(r'[\.\s]', '', skill_lower)
+    return skill_lower
+
+
+def _normalized_embedding_matrix(embeddings: List[List[float]], dim: int) -> np.ndarray:
+    """
+    Stacks embeddings into an (N, dim) matrix with unit-length rows.
+    Missing or zero vectors stay as zero rows, so their similarity is 0.
+    """
+    matrix = np.zeros((len(embeddings), dim), dtype=np.float64)
+    for row, embedding in enumerate(embeddings):
+        if embedding:
+            matrix[row] = embedding
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+def batch_cosine_similarity(job_embedding: List[float], embeddings: List[List[float]]) -> np.ndarray:
+    """
+    Cosine similarity of every embedding against the job vector using a single
+    matrix-vector product. Matches `cosine_similarity` (clamped at 0).
+    """
+    similarities = np.zeros(len(embeddings), dtype=np.float64)
+    if not job_embedding or not embeddings:
+        return similarities
+
+    job_vector = np.asarray(job_embedding, dtype=np.float64)
+    job_norm = np.linalg.norm(job_vector)
+    if job_norm == 0:
+        return similarities
+
+    matrix = _normalized_embedding_matrix(embeddings, job_vector.shape[0])
+    return np.maximum(matrix @ (job_vector / job_norm), 0.0)
+
+
+def build_skill_matrices(
+    job: "JobDetails",
+    applicants: List["ApplicantProfile"]
+) -> tuple[sparse.csr_matrix, sparse.csr_matrix, np.ndarray, np.ndarray]:
+    """
+    Builds sparse applicant x skill matrices over the job's required and preferred skills.
+
+    Returns (claimed, mastery, required_mask, preferred_mask) where `claimed` is the
+    0/1 incidence of OCR skills, `mastery` holds verified mastery levels and the masks
+    select the required / preferred columns.
+    """
+    job_req_skills_norm = {normalize_skill(s) for s in job.required_skills}
+    job_pref_skills_norm = {normalize_skill(s) for s in job.preferred_skills}
+    skill_index = {
+        skill: col for col, skill in enumerate(sorted(job_req_skills_norm | job_pref_skills_norm))
+    }
+    shape = (len(applicants), len(skill_index))
+
+    claimed_rows, claimed_cols = [], []
+    mastery_rows, mastery_cols, mastery_values = [], [], []
+
+    for row, applicant in enumerate(applicants):
+        claimed = {skill_index[s] for s in map(normalize_skill, applicant.ocr_skills) if s in skill_index}
+        claimed_rows.extend([row] * len(claimed))
+        claimed_cols.extend(claimed)
+
+        # Later entries win, same as the dict built in the per-applicant path
+        verified = {normalize_skill(v.skill): v.mastery_level for v in applicant.verified_skills_data}
+        for skill, mastery in verified.items():
+            col = skill_index.get(skill)
+            if col is not None:
+                mastery_rows.append(row)
+                mastery_cols.append(col)
+                mastery_values.append(mastery)
+
+    claimed_matrix = sparse.csr_matrix(
+        (np.ones(len(claimed_rows), dtype=np.float64), (claimed_rows, claimed_cols)), shape=shape
+    )
+    mastery_matrix = sparse.csr_matrix(
+        (np.asarray(mastery_values, dtype=np.float64), (mastery_rows, mastery_cols)), shape=shape
+    )
+
+    required_mask = np.zeros(len(skill_index), dtype=np.float64)
+    required_mask[[skill_index[s] for s in job_req_skills_norm]] = 1.0
+    preferred_mask = np.zeros(len(skill_index), dtype=np.float64)
+    preferred_mask[[skill_index[s] for s in job_pref_skills_norm]] = 1.0
+
+    return claimed_matrix, mastery_matrix, required_mask, preferred_mask
+
+
+def compute_score_components(
+    job: "JobDetails",
+    applicants: List["ApplicantProfile"],
+    job_embedding: List[float]
+) -> Dict[str, np.ndarray]:
+    """
+    Computes every score component (0-100) for all applicants at once.
+    Keys match the weight names; each value is an array aligned with `applicants`.
+    """
+    num_applicants = len(applicants)
+    claimed, mastery, required_mask, preferred_mask = build_skill_matrices(job, applicants)
+    num_required = int(required_mask.sum())
+    num_preferred = int(preferred_mask.sum())
+
+    # 1. Semantic Scoring (one matrix-vector product per embedding type)
+    score_experience_match = batch_cosine_similarity(
+        job_embedding, [a.resume_embedding for a in applicants]
+    ) * 100.0
+    score_project_relevance = batch_cosine_similarity(
+        job_embedding, [a.project_embedding for a in applicants]
+    ) * 100.0
+
+    # 2. Skill Matching (OCR/Claimed skills)
+    if not num_required:
+        score_ocr_skills = np.full(num_applicants, 100.0)
+        score_verified_mastery = np.full(num_applicants, 100.0)
+    else:
+        score_ocr_skills = (claimed @ required_mask / num_required) * 100.0
+        # 3. Verified Skill Mastery
+        score_verified_mastery = (mastery @ required_mask / (num_required * MAX_SKILL_MASTERY)) * 100.0
+
+    if num_preferred:
+        score_bonus_skills = (claimed @ preferred_mask / num_preferred) * 100.0
+    else:
+        score_bonus_skills = np.zeros(num_applicants)
+
+    # 4. Project Level Assessment
+    score_project_level = np.array(
+        [float(PROJECT_LEVEL_SCORES.get(a.best_project_level, 0.0)) for a in applicants],
+        dtype=np.float64
+    )
+
+    return {
+        "verified_mastery": score_verified_mastery,
+        "experience_match": score_experience_match,
+        "ocr_skills": score_ocr_skills,
+        "project_level": score_project_level,
+        "bonus_skills": score_bonus_skills,
+        "project_relevance": score_project_relevance,
+    }
@@ -0,0 +1,92 @@
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+from api.config.config import (
+    SHORTLIST_CACHE_BACKEND, SHORTLIST_CACHE_PATH, SHORTLIST_CACHE_TTL, SHORTLIST_CACHE_MAX_ITEMS
+)
+from api.utils.result_cache import create_cache_backend
+
+# Bump when a score component changes meaning so cached shortlists are not reused
+SHORTLIST_CACHE_VERSION = "2"
+
+# Per job: every applicant's weight-independent score components and the DB
+# versions they were computed from (checked on every read, so changes made by the
+# frontend are picked up too), plus a list of applicants the API has queued for
+# rescoring. Opened on first use, falling back to memory if the file cannot be created.
+SHORTLIST_CACHE = create_cache_backend(
+    SHORTLIST_CACHE_BACKEND,
+    path=SHORTLIST_CACHE_PATH,
+    max_items=SHORTLIST_CACHE_MAX_ITEMS,
+    default_ttl=SHORTLIST_CACHE_TTL
+)
+
+
+def _entry_key(job_id: str) -> str:
+    return f"shortlist:{SHORTLIST_CACHE_VERSION}:{job_id}"
+
+
+def _stale_key(job_id: str) -> str:
+    return f"shortlist-stale:{SHORTLIST_CACHE_VERSION}:{job_id}"
+
+
+# Serializes read-modify-write of the stale lists (callers run on executor threads)
+_STALE_LOCK = threading.Lock()
+
+
+def get_cached_components(job_id: str, llm_model_name: str, embedding_model_name: str) -> Optional[Dict[str, Any]]:
+    """
+    Returns the job's cache entry, or None if missing or computed with other models:
+    {"versions": {"job", "applicants": {id: version}}, "applicants": [{"id", "name",
+    "components": {name: score}}]}, with applicants in ranking tie-break order.
+    """
+    entry = SHORTLIST_CACHE.get(_entry_key(job_id))
+    if entry is None or entry["models"] != [llm_model_name, embedding_model_name]:
+        return None
+    return entry
+
+
+def cache_components(
+    job_id: str,
+    llm_model_name: str,
+    embedding_model_name: str,
+    applicants: List[Dict],
+    versions: Dict[str, Any]
+) -> None:
+    SHORTLIST_CACHE.set(_entry_key(job_id), {
+        "models": [llm_model_name, embedding_model_name],
+        "versions": versions,
+        "applicants": applicants
+    })
+
+
+def mark_applicants_stale(job_id: str, applicant_ids: Iterable[str]) -> None:
+    """Queues applicants (new applications, changed resumes or verified skills) for rescoring."""
+    with _STALE_LOCK:
+        stale = set(SHORTLIST_CACHE.get(_stale_key(job_id)) or [])
+        stale.update(applicant_ids)
+        SHORTLIST_CACHE.set(_stale_key(job_id), sorted(stale))
+
+
+def get_stale_applicants(job_id: str) -> List[str]:
+    """Applicants queued for rescoring. They stay queued until `clear_stale_applicants`."""
+    return SHORTLIST_CACHE.get(_stale_key(job_id)) or []
+
+
+def clear_stale_applicants(job_id: str, applicant_ids: Iterable[str]) -> None:
+    """Unqueues applicants once their rescored components are cached; later marks survive."""
+    done = set(applicant_ids)
+    if not done:
+        return
+    with _STALE_LOCK:
+        stale = [a for a in SHORTLIST_CACHE.get(_stale_key(job_id)) or [] if a not in done]
+        if stale:
+            SHORTLIST_CACHE.set(_stale_key(job_id), stale)
+        else:
+            SHORTLIST_CACHE.delete(_stale_key(job_id))
+
+
+def invalidate_job(job_id: str) -> None:
+    """Drops everything cached for the job (e.g. its description or skills changed)."""
+    with _STALE_LOCK:
+        SHORTLIST_CACHE.delete(_entry_key(job_id))
+        SHORTLIST_CACHE.delete(_stale_key(job_id))
@@ -1,30 +1,45 @@
-import os
-import re
-import psycopg2
+import hashlib
 import numpy as np 
 import asyncio
-from psycopg2.extras import DictCursor
-from typing import List, Dict, Optional, Any, Callable
+import psycopg2
+from psycopg2.extras import execute_values
+from typing import List, Dict, Optional, Any, Callable, Awaitable
 from fastapi import HTTPException
-from fastapi.concurrency import run_in_threadpool # REQUIRED for synchronous work
 from contextlib import AbstractContextManager
 
 # Import data models and DSPy module from the models file
-from app.models.shortlister_models import (
+from api.models.shortlister_models import (
     JobDetails, ApplicantProfile, ApplicantScore, VerifiedSkill, ProjectLevelAssessor
 )
+from api.utils.embedding_cache import EmbeddingCache
+from api.utils.db import get_db_connection
+from api.utils.executors import EXECUTORS
+from api.utils.cpu_tasks import scoring_payload, score_components
+from api.utils.scoring import (
+    PROJECT_LEVEL_SCORES, MAX_SKILL_MASTERY, normalize_skill, compute_score_components
+)
+from api.utils.singleflight import SingleFlight
+from api.utils.shortlist_cache import (
+    get_cached_components, cache_components, get_stale_applicants, clear_stale_applicants, mark_applicants_stale
+)
 
 # --- Initialization & Globals ---
-# NOTE: DATABASE_URL must be set in the environment where the FastAPI app runs
-DATABASE_URL = os.getenv("DATABASE_URL")
+DEFAULT_WEIGHTS = {
+    "verified_mastery": 0.35, "experience_match": 0.25, "ocr_skills": 0.15,
+    "project_level": 0.10, "bonus_skills": 0.10, "project_relevance": 0.05
+}
 
-# --- Helper Functions ---
-def normalize_skill(skill: str) -> str:
-    """Standardizes a skill name for reliable comparison."""
-    skill_lower = skill.lower().strip()
-    skill_lower = re.sub(r'[\.\s]', '', skill_lower)
-    return skill_lower
+# Score component -> key used in the ApplicantScore breakdown (order matters for the final sum)
+BREAKDOWN_KEYS = {
+    "verified_mastery": "verified_mastery_score",
+    "experience_match": "experience_match_score",
+    "ocr_skills": "required_skills_score_ocr",
+    "project_level": "project_level_score",
+    "bonus_skills": "bonus_skills_score",
+    "project_relevance": "project_relevance_score",
+}
 
+# --- Helper Functions ---
 def cosine_similarity(v1: List[float], v2: List[float]) -> float:
     """Calculates cosine similarity between two vector lists."""
     if not v1 or not v2:
@@ -50,11 +65,38 @@ def cosine_similarity(v1: List[float], v2: List[float]) -> float:
     return max(0, similarity)
 
 
+def project_text_hash(project_text: str) -> str:
+    """sha256 of the project text; matches encode(sha256(convert_to(text, 'UTF8')), 'hex') in SQL."""
+    return hashlib.sha256(project_text.encode("utf-8")).hexdigest()
+
+
+def embedding_to_bytes(embedding: List[float]) -> bytes:
+    return np.asarray(embedding, dtype=np.float32).tobytes()
+
+
+def embedding_from_bytes(blob: Optional[bytes]) -> List[float]:
+    """Decodes a float32 bytea column (empty list for NULL)."""
+    if blob is None:
+        return []
+    return np.frombuffer(blob, dtype=np.float32).tolist()
+
+
+def _assess_with_llm(
+    project_text: str,
+    assessor_module: ProjectLevelAssessor,
+    llm_context_factory: Callable[[], AbstractContextManager[Any]]
+) -> str:
+    """Single LLM assessment call. Raises on failure so callers decide the fallback."""
+    # Use a fresh (thread-local) context to configure the LLM for the DSPy call
+    with llm_context_factory():
+        return assessor_module.forward(project_text=project_text)
+
+
 def get_applicant_project_level(
     project_text: str, 
     db_level: Optional[str],
     assessor_module: ProjectLevelAssessor,
-    llm_context_manager: AbstractContextManager[Any]
+    llm_context_factory: Callable[[], AbstractContextManager[Any]]
 ) -> Optional[str]:
     """
     Determines the best project level. Runs the dspy LLM model on the project text
@@ -66,95 +108,335 @@ def get_applicant_project_level(
     if not project_text or len(project_text) < 20:
         return "Beginner"
 
-    # Use the provided context manager to configure the LLM for the DSPy call
     try:
-        with llm_context_manager:
-            return assessor_module.forward(project_text=project_text)
+        return _assess_with_llm(project_text, assessor_module, llm_context_factory)
     except Exception as e:
         # Fallback in case of LLM failure
         print(f"LLM Assessment failed: {e}. Defaulting to Beginner.")
         return "Beginner"
 
 
-def get_job_and_applicants_data(
+def best_project_level(levels: List[str]) -> Optional[str]:
+    """Picks the highest known level from an applicant's Project rows (None if there are none)."""
+    if not levels:
+        return None
+    return max(levels, key=lambda level: PROJECT_LEVEL_SCORES.get(level, 0))
+
+
+# One row per applicant: projects are aggregated in a LATERAL subquery, and the stored
+# LLM level / precomputed embeddings only join while their content hashes still match.
+_APPLICANT_PROFILE_QUERY = """
+    SELECT 
+        T1.id, T2.name, T1."rawResumeText", T1."resumeProjectText",
+        COALESCE(T4.levels, '{{}}') AS db_project_levels,
+        T5."projectLevel" AS assessed_project_level,
+        T6."resumeEmbedding", T6."projectEmbedding"
+    FROM "Applicant" AS T1
+    INNER JOIN "User" AS T2 ON T1."userId" = T2.id
+    {join}
+    LEFT JOIN LATERAL (
+        SELECT array_agg(P."projectLevel") AS levels
+        FROM "Project" AS P
+        WHERE P."applicantId" = T1.id AND P."projectLevel" IS NOT NULL
+    ) AS T4 ON TRUE
+    LEFT JOIN "ProjectLevelAssessment" AS T5
+        ON T5."applicantId" = T1.id AND T5."modelName" = %s
+        AND T5."textHash" = encode(sha256(convert_to(T1."resumeProjectText", 'UTF8')), 'hex')
+    LEFT JOIN "ApplicantFeature" AS T6
+        ON T6."applicantId" = T1.id AND T6."embeddingModel" = %s
+        AND T6."resumeHash" = encode(sha256(convert_to(T1."rawResumeText", 'UTF8')), 'hex')
+        AND T6."projectHash" = encode(sha256(convert_to(COALESCE(T1."resumeProjectText", ''), 'UTF8')), 'hex')
+    WHERE {where} AND COALESCE(T1."rawResumeText", '') <> ''
+"""
+
+
+def _fetch_applicant_profiles(
+    cursor,
+    join: str,
+    where: str,
+    params: tuple,
+    llm_model_name: str,
+    embedding_model_name: str
+) -> List[ApplicantProfile]:
+    """Runs the applicant query plus one verified-skills query for all returned applicants."""
+    cursor.execute(
+        _APPLICANT_PROFILE_QUERY.format(join=join, where=where),
+        (llm_model_name, embedding_model_name, *params)
+    )
+    db_applicants_raw: List[Dict[str, Any]] = cursor.fetchall()
+    if not db_applicants_raw:
+        return []
+
+    # Get all "verified" skills for these applicants in one round-trip
+    applicant_ids = [row['id'] for row in db_applicants_raw]
+    cursor.execute(
+        'SELECT "applicantId", "skillName", "masteryLevel" FROM "VerifiedSkill" WHERE "applicantId" = ANY(%s)',
+        (applicant_ids,)
+    )
+    verified_by_applicant: Dict[str, List[VerifiedSkill]] = {}
+    for row in cursor.fetchall():
+        verified_by_applicant.setdefault(row['applicantId'], []).append(
+            VerifiedSkill(skillName=row['skillName'], masteryLevel=row['masteryLevel'])
+        )
+
+    return [
+        ApplicantProfile(
+            id=app_row['id'],
+            name=app_row['name'],
+            rawResumeText=app_row['rawResumeText'],
+            ocr_skills=[], # Assuming this needs to be fetched separately if needed
+            resumeProjectText=app_row['resumeProjectText'] or "",
+            verified_skills_data=verified_by_applicant.get(app_row['id'], []),
+            best_project_level=(
+                best_project_level(app_row['db_project_levels']) or app_row['assessed_project_level']
+            ),
+            # Precomputed embeddings if still valid, otherwise filled by the async router
+            resume_embedding=embedding_from_bytes(app_row['resumeEmbedding']),
+            project_embedding=embedding_from_bytes(app_row['projectEmbedding'])
+        )
+        for app_row in db_applicants_raw
+    ]
+
+
+def fetch_job_and_applicants(
+    cursor,
     job_id: str,
-    assessor_module: ProjectLevelAssessor,
-    llm_context_manager: AbstractContextManager[Any]
+    llm_model_name: str,
+    embedding_model_name: str,
+    applicant_ids: Optional[List[str]] = None
 ) -> tuple[JobDetails, List[ApplicantProfile]]:
     """
-    Fetches job and applicant data from the database, and performs the LLM
-    project assessment step. This is a synchronous operation run in a threadpool.
+    Set-based fetch of a job and its applicants: one query for the job, one for
+    the applicants (projects aggregated per applicant in SQL) and one for all of
+    their verified skills. `best_project_level` holds the DB level or, failing
+    that, a previous LLM assessment by `llm_model_name` of the same project text.
+    Embeddings precomputed with `embedding_model_name` for the current texts are
+    loaded as well; the rest stay empty. `applicant_ids` limits the applicants
+    loaded to those (still applied) ones.
     """
-    if not DATABASE_URL:
-        raise HTTPException(status_code=500, detail="Database configuration missing.")
-        
-    conn = psycopg2.connect(DATABASE_URL, cursor_factory=DictCursor)
-    cursor = conn.cursor()
-
     # 1. Get Job Data
     cursor.execute('SELECT id, description, "skillsRequired", perks FROM "Internship" WHERE id = %s', (job_id,))
     db_job = cursor.fetchone()
     if not db_job:
-        cursor.close()
-        conn.close()
         raise HTTPException(status_code=404, detail="Internship not found")
     job_data = JobDetails(**dict(db_job))
 
-    # 2. Get Applicant Data
-    cursor.execute(
-        """
-        SELECT 
-            T1.id, T2.name, T1."rawResumeText", T1."resumeProjectText", T4."projectLevel" as db_project_level
-        FROM "Applicant" AS T1
-        INNER JOIN "User" AS T2 ON T1."userId" = T2.id
-        INNER JOIN "InternshipApplication" AS T3 ON T1.id = T3."applicantId"
-        LEFT JOIN "Project" AS T4 ON T1.id = T4."applicantId" 
-        WHERE T3."internshipId" = %s
-        """,
-        (job_id,)
+    # 2. Get Applicant Data (one row per applicant) and their verified skills
+    where, params = 'T3."internshipId" = %s', (job_id,)
+    if applicant_ids is not None:
+        where, params = where + " AND T1.id = ANY(%s)", (job_id, list(applicant_ids))
+    applicant_profiles = _fetch_applicant_profiles(
+        cursor,
+        join='INNER JOIN "InternshipApplication" AS T3 ON T1.id = T3."applicantId"',
+        where=where,
+        params=params,
+        llm_model_name=llm_model_name,
+        embedding_model_name=embedding_model_name
     )
-    db_applicants_raw: List[Dict[str, Any]] = cursor.fetchall()
-    
-    applicant_profiles = []
-    
-    # Process Applicants and run LLM assessment where needed
-    for app_row in db_applicants_raw:
-        if not app_row['rawResumeText']: continue
+    return job_data, applicant_profiles
 
-        applicant_id = app_row['id']
-        
-        # Get all "verified" skills
-        cursor.execute('SELECT "skillName", "masteryLevel" FROM "VerifiedSkill" WHERE "applicantId" = %s', (applicant_id,))
-        verified_skills_data = [VerifiedSkill(**dict(row)) for row in cursor.fetchall()]
-
-        # Determine project level using LLM/DB (Synchronous DSPy call)
-        best_project_level = get_applicant_project_level(
-            project_text=app_row['resumeProjectText'] or "",
-            db_level=app_row['db_project_level'],
-            assessor_module=assessor_module,
-            llm_context_manager=llm_context_manager
+
+def get_job_and_applicants_data(
+    job_id: str,
+    llm_model_name: str,
+    embedding_model_name: str,
+    applicant_ids: Optional[List[str]] = None
+) -> tuple[JobDetails, List[ApplicantProfile]]:
+    """
+    Fetches job and applicant data from the database using a pooled connection.
+    This is a synchronous operation run on the "db" executor.
+    """
+    with get_db_connection() as conn, conn.cursor() as cursor:
+        return fetch_job_and_applicants(cursor, job_id, llm_model_name, embedding_model_name, applicant_ids)
+
+
+# What a job's cached shortlist depends on. The job is versioned by the columns
+# that feed scoring only (its updatedAt also moves on application/view counters).
+# Per applicant: latest change and row counts (so deletions show up too) of
+# everything `fetch_job_and_applicants` reads.
+_SHORTLIST_VERSION_QUERY = """
+    SELECT
+        md5(concat_ws(
+            E'\\x1f', I.description,
+            array_to_string(I."skillsRequired", E'\\x1f'), array_to_string(I.perks, E'\\x1f')
+        )) AS job_version,
+        T3."applicantId" AS id,
+        concat_ws('|', T3."createdAt", T1."updatedAt", T2."updatedAt", VS.n, VS.updated, PR.n, PR.updated) AS version
+    FROM "Internship" AS I
+    LEFT JOIN "InternshipApplication" AS T3 ON T3."internshipId" = I.id
+    LEFT JOIN "Applicant" AS T1 ON T1.id = T3."applicantId"
+    LEFT JOIN "User" AS T2 ON T2.id = T1."userId"
+    LEFT JOIN LATERAL (
+        SELECT count(*) AS n, max(V."updatedAt") AS updated
+        FROM "VerifiedSkill" AS V WHERE V."applicantId" = T3."applicantId"
+    ) AS VS ON TRUE
+    LEFT JOIN LATERAL (
+        SELECT count(*) AS n, max(P."updatedAt") AS updated
+        FROM "Project" AS P WHERE P."applicantId" = T3."applicantId"
+    ) AS PR ON TRUE
+    WHERE I.id = %s
+"""
+
+
+def get_shortlist_versions(job_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Current DB versions for a job's shortlist, as {"job": version, "applicants":
+    {id: version}}, in one query; None if the internship does not exist.
+    Compared against the cache entry before it is reused.
+    """
+    with get_db_connection() as conn, conn.cursor() as cursor:
+        cursor.execute(_SHORTLIST_VERSION_QUERY, (job_id,))
+        rows = cursor.fetchall()
+    if not rows:
+        return None
+    return {
+        "job": rows[0]["job_version"],
+        "applicants": {row["id"]: row["version"] for row in rows if row["id"] is not None}
+    }
+
+
+def get_applicant_job_ids(applicant_id: str) -> List[str]:
+    """Internships the applicant has applied to (whose cached shortlists they appear in)."""
+    with get_db_connection() as conn, conn.cursor() as cursor:
+        cursor.execute(
+            'SELECT "internshipId" FROM "InternshipApplication" WHERE "applicantId" = %s',
+            (applicant_id,)
         )
-        
-        applicant_profiles.append(
-            ApplicantProfile(
-                id=applicant_id,
-                name=app_row['name'],
-                rawResumeText=app_row['rawResumeText'],
-                ocr_skills=[], # Assuming this needs to be fetched separately if needed
-                resumeProjectText=app_row['resumeProjectText'] or "",
-                verified_skills_data=verified_skills_data,
-                best_project_level=best_project_level,
-                # Embeddings are empty lists for now, to be filled by the async router
-                resume_embedding=[],
-                project_embedding=[]
-            )
+        return [row["internshipId"] for row in cursor.fetchall()]
+
+
+def get_applicant_data(
+    applicant_id: str,
+    llm_model_name: str,
+    embedding_model_name: str
+) -> Optional[ApplicantProfile]:
+    """Fetches a single applicant's profile (None if missing or without resume text)."""
+    with get_db_connection() as conn, conn.cursor() as cursor:
+        profiles = _fetch_applicant_profiles(
+            cursor,
+            join="",
+            where="T1.id = %s",
+            params=(applicant_id,),
+            llm_model_name=llm_model_name,
+            embedding_model_name=embedding_model_name
         )
+    return profiles[0] if profiles else None
 
-    cursor.close()
-    conn.close()
-    
-    unique_profiles = {p.id: p for p in applicant_profiles}
-    return job_data, list(unique_profiles.values())
+
+def store_applicant_features(applicant_profiles: List[ApplicantProfile], embedding_model_name: str) -> None:
+    """
+    Upserts precomputed embeddings into "ApplicantFeature", tagged with the hashes of
+    the texts they were computed from so stale rows are ignored by the loader.
+    """
+    rows = [
+        (
+            p.id, embedding_model_name,
+            project_text_hash(p.raw_resume_text), project_text_hash(p.ocr_projects_text),
+            psycopg2.Binary(embedding_to_bytes(p.resume_embedding)),
+            psycopg2.Binary(embedding_to_bytes(p.project_embedding))
+        )
+        for p in applicant_profiles if p.resume_embedding and p.project_embedding
+    ]
+    if not rows:
+        return
+
+    with get_db_connection() as conn, conn.cursor() as cursor:
+        execute_values(
+            cursor,
+            """
+            INSERT INTO "ApplicantFeature"
+                ("applicantId", "embeddingModel", "resumeHash", "projectHash",
+                 "resumeEmbedding", "projectEmbedding", "updatedAt")
+            VALUES %s
+            ON CONFLICT ("applicantId") DO UPDATE
+            SET "embeddingModel" = EXCLUDED."embeddingModel", "resumeHash" = EXCLUDED."resumeHash",
+                "projectHash" = EXCLUDED."projectHash", "resumeEmbedding" = EXCLUDED."resumeEmbedding",
+                "projectEmbedding" = EXCLUDED."projectEmbedding", "updatedAt" = now()
+            """,
+            rows,
+            template="(%s, %s, %s, %s, %s, %s, now())"
+        )
+
+
+def store_project_levels(applicant_profiles: List[ApplicantProfile], assessed: Dict[str, str], llm_model_name: str) -> None:
+    """
+    Writes LLM-assessed levels back to "ProjectLevelAssessment" (one row per applicant
+    and model). The stored text hash replaces any previous one, so a changed project
+    text invalidates the old assessment.
+    """
+    rows = [
+        (p.id, llm_model_name, project_text_hash(p.ocr_projects_text), assessed[p.ocr_projects_text])
+        for p in applicant_profiles if p.ocr_projects_text in assessed
+    ]
+    if not rows:
+        return
+
+    with get_db_connection() as conn, conn.cursor() as cursor:
+        execute_values(
+            cursor,
+            """
+            INSERT INTO "ProjectLevelAssessment" ("applicantId", "modelName", "textHash", "projectLevel", "updatedAt")
+            VALUES %s
+            ON CONFLICT ("applicantId", "modelName") DO UPDATE
+            SET "textHash" = EXCLUDED."textHash", "projectLevel" = EXCLUDED."projectLevel", "updatedAt" = now()
+            """,
+            rows,
+            template="(%s, %s, %s, %s, now())"
+        )
+
+
+# --- LLM Project Assessment Stage (Async) ---
+def _needs_llm_assessment(profile: ApplicantProfile) -> bool:
+    """No DB level, and enough project text for the LLM (shorter texts are rated Beginner)."""
+    text = profile.ocr_projects_text
+    return not profile.best_project_level and bool(text) and len(text) >= 20
+
+
+async def assess_project_levels(
+    applicant_profiles: List[ApplicantProfile],
+    assessor_module: ProjectLevelAssessor,
+    llm_context_factory: Callable[[], AbstractContextManager[Any]],
+    max_concurrency: int = 8
+) -> Dict[str, str]:
+    """
+    Fills `best_project_level` for applicants without a DB level. Identical project
+    texts are assessed once, and LLM calls run concurrently (capped by
+    `max_concurrency`), each bounded by the LM's request timeout.
+
+    Returns {project_text: level} for the texts the LLM actually assessed
+    (fallbacks after failures or timeouts are not included).
+    """
+    pending: Dict[str, List[ApplicantProfile]] = {}
+    for profile in applicant_profiles:
+        if profile.best_project_level:
+            continue
+        if not _needs_llm_assessment(profile):
+            profile.best_project_level = "Beginner"
+            continue
+        pending.setdefault(profile.ocr_projects_text, []).append(profile)
+
+    if not pending:
+        return {}
+
+    print(f"INFO: Assessing {len(pending)} unique project texts with the LLM...")
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def assess(text: str) -> Optional[str]:
+        async with semaphore:
+            try:
+                return await EXECUTORS.run("llm", _assess_with_llm, text, assessor_module, llm_context_factory)
+            except Exception as e:
+                print(f"LLM Assessment failed: {e}. Defaulting to Beginner.")
+            return None
+
+    levels = await asyncio.gather(*(assess(text) for text in pending))
+    assessed: Dict[str, str] = {}
+    for text, level in zip(pending, levels):
+        if level is not None:
+            assessed[text] = level
+        for profile in pending[text]:
+            profile.best_project_level = level or "Beginner"
+    return assessed
 
 # --- Core Calculation Logic (Synchronous) ---
 def calculate_shortlist(
@@ -167,11 +449,6 @@ def calculate_shortlist(
     Calculates the weighted score for each applicant using pre-calculated embeddings.
     This function is purely synchronous and mathematical (suitable for threadpool).
     """
-    
-    DEFAULT_WEIGHTS = {
-        "verified_mastery": 0.35, "experience_match": 0.25, "ocr_skills": 0.15,
-        "project_level": 0.10, "bonus_skills": 0.10, "project_relevance": 0.05
-    }
     weights = custom_weights if custom_weights else DEFAULT_WEIGHTS
     scored_applicants = []
     
@@ -179,7 +456,7 @@ def calculate_shortlist(
     job_req_skills_norm = {normalize_skill(s) for s in job.required_skills}
     job_pref_skills_norm = {normalize_skill(s) for s in job.preferred_skills}
 
-    project_level_map = {"Beginner": 30, "Intermediate": 60, "Advanced": 90} 
+    project_level_map = PROJECT_LEVEL_SCORES
 
     for applicant in applicants:
         app_skills_norm = {normalize_skill(s) for s in applicant.ocr_skills}
@@ -212,7 +489,6 @@ def calculate_shortlist(
                 for v in applicant.verified_skills_data
             }
             total_mastery_score = 0.0
-            MAX_SKILL_MASTERY = 10.0 # Assuming mastery level is out of 10
             for req_skill in job_req_skills_norm:
                 mastery = app_verified_map.get(req_skill, 0.0)
                 total_mastery_score += mastery
@@ -255,24 +531,243 @@ def calculate_shortlist(
     return sorted(scored_applicants, key=lambda x: x.final_score, reverse=True)
 
 
-# --- Synchronous Orchestration Function (Inner Call) ---
-def get_job_and_applicants_for_scoring(
-    job_id: str,
+# --- Vectorized Batch Scoring (Synchronous) ---
+def combine_score_components(components: Dict[str, np.ndarray], weights: Dict[str, float]) -> np.ndarray:
+    """Weighted sum of the score components, in the same order as `calculate_shortlist`."""
+    final_scores = np.zeros_like(components["verified_mastery"])
+    for name in BREAKDOWN_KEYS:
+        final_scores = final_scores + components[name] * weights[name]
+    return final_scores
+
+
+def rank_scores(scores: np.ndarray, top_k: Optional[int] = None, offset: int = 0) -> np.ndarray:
+    """
+    Indices of the ranked slice [offset, offset + top_k) by descending score, ties
+    broken by original position (same order as a stable full sort). Uses
+    argpartition so only the candidates for the slice are sorted.
+    """
+    num_scores = len(scores)
+    end = num_scores if top_k is None else min(num_scores, offset + top_k)
+    if offset >= end:
+        return np.empty(0, dtype=np.intp)
+
+    if end < num_scores:
+        # Everything scoring at least the end-th best value; includes ties at the boundary
+        boundary = scores[np.argpartition(-scores, end - 1)[end - 1]]
+        candidates = np.flatnonzero(scores >= boundary)
+    else:
+        candidates = np.arange(num_scores)
+
+    ranked = candidates[np.lexsort((candidates, -scores[candidates]))]
+    return ranked[offset:end]
+
+
+def calculate_shortlist_batch(
+    job: JobDetails,
+    applicants: List[ApplicantProfile],
+    job_embedding: List[float],
+    custom_weights: Optional[Dict[str, float]] = None,
+    top_k: Optional[int] = None,
+    offset: int = 0
+) -> List[ApplicantScore]:
+    """
+    Vectorized equivalent of `calculate_shortlist` for large applicant pools.
+    Embeddings are stacked into pre-normalized matrices and skills into sparse
+    incidence matrices, so scoring is a handful of matrix-vector products.
+    With `top_k`/`offset` only that slice of the ranking is selected and built.
+    """
+    if not applicants:
+        return []
+
+    components = compute_score_components(job, applicants, job_embedding)
+    return rank_components(
+        [a.id for a in applicants], [a.name for a in applicants], components,
+        custom_weights, top_k=top_k, offset=offset
+    )
+
+
+def rank_components(
+    applicant_ids: List[str],
+    names: List[str],
+    components: Dict[str, np.ndarray],
+    custom_weights: Optional[Dict[str, float]] = None,
+    top_k: Optional[int] = None,
+    offset: int = 0
+) -> List[ApplicantScore]:
+    """
+    Weights precomputed score components and builds the ranked slice. Cheap
+    (no DB, LLM or embedding work), so a weight change is just another call.
+    """
+    if not applicant_ids:
+        return []
+
+    weights = custom_weights if custom_weights else DEFAULT_WEIGHTS
+    final_scores = combine_score_components(components, weights)
+
+    rounded_scores = np.array([round(float(s), 2) for s in final_scores])
+    order = rank_scores(rounded_scores, top_k=top_k, offset=offset)
+
+    return [
+        ApplicantScore(
+            applicant_id=applicant_ids[i], name=names[i],
+            final_score=float(rounded_scores[i]),
+            breakdown={
+                key: round(float(components[name][i]), 2)
+                for name, key in BREAKDOWN_KEYS.items()
+            }
+        )
+        for i in order
+    ]
+
+
+# --- Cached Embedding Lookup (Async) ---
+async def embed_texts(
+    texts: List[str],
+    embedding_function: Callable[[List[str]], Awaitable[List[List[float]]]],
+    embedding_cache: Optional[EmbeddingCache] = None
+) -> List[List[float]]:
+    """
+    Returns one embedding per input text. Identical texts are embedded once and,
+    when a cache is given, only cache misses are sent to the embedding provider.
+    """
+    unique_texts = list(dict.fromkeys(texts))
+
+    cached: Dict[str, List[float]] = {}
+    if embedding_cache is not None:
+        cached = await EXECUTORS.run("io", embedding_cache.get_many, unique_texts)
+
+    misses = [text for text in unique_texts if text not in cached]
+    print(f"INFO: Embeddings: {len(cached)} cached, {len(misses)} to fetch from provider.")
+
+    fetched = await embedding_function(misses) if misses else []
+    fetched_map = dict(zip(misses, fetched))
+
+    if embedding_cache is not None and fetched_map:
+        await EXECUTORS.run("io", embedding_cache.put_many, fetched_map)
+
+    lookup = {**cached, **fetched_map}
+    return [lookup[text] for text in texts]
+
+
+# --- Application-time Feature Precomputation (Async) ---
+async def precompute_applicant_features(
+    applicant_id: str,
     assessor_module: ProjectLevelAssessor,
-    llm_context_manager: AbstractContextManager[Any]
-) -> tuple[JobDetails, List[ApplicantProfile]]:
+    llm_context_factory: Callable[[], AbstractContextManager[Any]],
+    llm_model_name: str,
+    embedding_function: Callable[[List[str]], Awaitable[List[List[float]]]],
+    embedding_model_name: str,
+    embedding_cache: Optional[EmbeddingCache] = None
+) -> bool:
     """
-    Synchronous function to orchestrate data fetching (DB) and LLM assessment (DSPy).
-    This runs inside the threadpool.
+    Computes and stores an applicant's resume/project embeddings and project level,
+    so later shortlists only load vectors and do math. Meant to run when an
+    application is created or a resume is (re)parsed. Returns False if the
+    applicant has no resume text.
     """
-    
-    # 1. Fetch data from DB, including LLM assessment step
-    job_data, applicant_profiles = get_job_and_applicants_data(
-        job_id=job_id,
-        assessor_module=assessor_module,
-        llm_context_manager=llm_context_manager
+    profile = await EXECUTORS.run("db", get_applicant_data, applicant_id, llm_model_name, embedding_model_name)
+    if profile is None:
+        print(f"WARNING: No resume text for applicant {applicant_id}; skipping feature precomputation.")
+        return False
+
+    assessed_levels, embeddings = await asyncio.gather(
+        assess_project_levels([profile], assessor_module, llm_context_factory),
+        embed_texts([profile.raw_resume_text, profile.ocr_projects_text], embedding_function, embedding_cache)
     )
-    return job_data, applicant_profiles
+    profile.resume_embedding, profile.project_embedding = embeddings
+
+    await EXECUTORS.run("db", store_applicant_features, [profile], embedding_model_name)
+    if assessed_levels:
+        await EXECUTORS.run("db", store_project_levels, [profile], assessed_levels, llm_model_name)
+    # New application or changed resume: rescore just this applicant in cached shortlists
+    await EXECUTORS.run("db", invalidate_applicant_shortlists, applicant_id)
+
+    print(f"INFO: Stored precomputed features for applicant {applicant_id}.")
+    return True
+
+
+# --- Score Components for a Set of Applicants (Async) ---
+async def score_applicant_components(
+    job_data: JobDetails,
+    applicant_profiles: List[ApplicantProfile],
+    assessor_module: ProjectLevelAssessor,
+    llm_context_factory: Callable[[], AbstractContextManager[Any]],
+    llm_model_name: str,
+    embedding_function: Callable[[List[str]], Awaitable[List[List[float]]]],
+    embedding_cache: Optional[EmbeddingCache] = None,
+    llm_concurrency: int = 8
+) -> tuple[Dict[str, np.ndarray], List[str]]:
+    """
+    LLM project assessment and embedding (async, overlapped) for the given
+    applicants, then their weight-independent score components (CPU executor).
+
+    Also returns the ids of applicants whose project level is only the fallback
+    after an LLM failure or timeout, so callers do not cache it as final.
+    """
+    needs_assessment = [app for app in applicant_profiles if _needs_llm_assessment(app)]
+
+    # Collect all texts that need embedding (applicants with precomputed features are skipped)
+    needs_embedding = [app for app in applicant_profiles if not (app.resume_embedding and app.project_embedding)]
+    texts_to_embed = [job_data.description]
+    for app in needs_embedding:
+        texts_to_embed.append(app.raw_resume_text)
+        texts_to_embed.append(app.ocr_projects_text)
+
+    # Both stages are I/O bound, so the LLM calls overlap with the embedding batches
+    assessed_levels, embeddings = await asyncio.gather(
+        assess_project_levels(
+            applicant_profiles,
+            assessor_module=assessor_module,
+            llm_context_factory=llm_context_factory,
+            max_concurrency=llm_concurrency
+        ),
+        embed_texts(texts_to_embed, embedding_function, embedding_cache)
+    )
+    
+    fallback_ids = [app.id for app in needs_assessment if app.ocr_projects_text not in assessed_levels]
+
+    # Persist fresh assessments so later shortlists (for any internship) skip the LLM
+    if assessed_levels:
+        try:
+            await EXECUTORS.run("db", store_project_levels, applicant_profiles, assessed_levels, llm_model_name)
+        except Exception as e:
+            print(f"WARNING: Could not store project level assessments: {e}")
+
+    # Distribute embeddings back into the data structures
+    job_embedding = embeddings[0]
+    for i, app in enumerate(needs_embedding):
+        app.resume_embedding = embeddings[1 + 2 * i]
+        app.project_embedding = embeddings[2 + 2 * i]
+
+    # Plain data only: unpickling the models in a worker process would import DSPy
+    job_payload, applicant_payloads = scoring_payload(job_data, applicant_profiles)
+    components = await EXECUTORS.run("cpu", score_components, job_payload, applicant_payloads, job_embedding)
+    return components, fallback_ids
+
+
+def _cache_rows(applicant_profiles: List[ApplicantProfile], components: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": app.id,
+            "name": app.name,
+            "components": {name: float(components[name][i]) for name in BREAKDOWN_KEYS}
+        }
+        for i, app in enumerate(applicant_profiles)
+    ]
+
+
+def invalidate_applicant_shortlists(applicant_id: str) -> None:
+    """
+    Queues the applicant for rescoring in every shortlist they appear in (call
+    after a new application, a resume re-parse or a verified-skill change).
+    Blocking (one DB query); run it on the "db" executor.
+    """
+    for job_id in get_applicant_job_ids(applicant_id):
+        mark_applicants_stale(job_id, [applicant_id])
+
+
+# Concurrent shortlist reads for one job share a single load/refresh of its components
+_COMPONENT_FLIGHTS = SingleFlight("Shortlist components")
 
 
 # --- Hybrid Orchestration Function (API Call Target) ---
@@ -280,51 +775,107 @@ async def get_shortlist_logic_hybrid(
     job_id: str, 
     weights: dict,
     assessor_module: ProjectLevelAssessor,
-    llm_context_manager: AbstractContextManager[Any],
-    embedding_function: Callable[[str], List[float]] # Async callback from router
+    llm_context_factory: Callable[[], AbstractContextManager[Any]],
+    llm_model_name: str,
+    embedding_function: Callable[[List[str]], Awaitable[List[List[float]]]], # EmbeddingProvider.embed from router
+    embedding_model_name: str,
+    embedding_cache: Optional[EmbeddingCache] = None,
+    llm_concurrency: int = 8,
+    top_k: Optional[int] = None,
+    offset: int = 0
 ) -> List[ApplicantScore]:
     """
-    Hybrid function to orchestrate data fetching (sync), embedding (async), and scoring (sync).
+    Hybrid function to orchestrate data fetching (sync), LLM assessment and
+    embedding (async, overlapped), and scoring (CPU executor).
+
+    Per-applicant score components are cached per job, so changing weights or
+    paging only re-weights them. Each read first checks the cache against the DB
+    versions (one query): a changed internship rebuilds everything, changed or
+    new applicants (and ones marked stale) are rescored alone and merged in, and
+    withdrawn ones are dropped.
     """
-    
-    # 1. Synchronous Work (DB Fetch + LLM Project Assessment) in a threadpool
-    print("INFO: Starting synchronous DB fetch and LLM assessment...")
-    job_data, applicant_profiles = await run_in_threadpool(
-        get_job_and_applicants_for_scoring, 
-        job_id=job_id,
+    scoring = dict(
         assessor_module=assessor_module,
-        llm_context_manager=llm_context_manager
+        llm_context_factory=llm_context_factory,
+        llm_model_name=llm_model_name,
+        embedding_function=embedding_function,
+        embedding_cache=embedding_cache,
+        llm_concurrency=llm_concurrency
     )
 
-    if not applicant_profiles:
-        return []
-        
-    # 2. Asynchronous Work (Hugging Face Embedding Calls)
-    print(f"INFO: Concurrently fetching {len(applicant_profiles)*2 + 1} embeddings from Hugging Face API...")
-    
-    # Collect all texts that need embedding
-    texts_to_embed = [job_data.description]
-    for app in applicant_profiles:
-        texts_to_embed.append(app.raw_resume_text)
-        texts_to_embed.append(app.ocr_projects_text)
+    async def load_components() -> List[Dict[str, Any]]:
+        # Read before the data, so anything that changes meanwhile is caught next time
+        versions = await EXECUTORS.run("db", get_shortlist_versions, job_id)
+        if versions is None:
+            raise HTTPException(status_code=404, detail="Internship not found")
+        stale = await EXECUTORS.run("io", get_stale_applicants, job_id)
+        cached = await EXECUTORS.run("io", get_cached_components, job_id, llm_model_name, embedding_model_name)
 
-    # Concurrently fetch all embeddings using the provided async callback
-    embeddings = await asyncio.gather(*(embedding_function(text) for text in texts_to_embed))
-    
-    # Distribute embeddings back into the data structures
-    job_embedding = embeddings.pop(0)
-    for app in applicant_profiles:
-        app.resume_embedding = embeddings.pop(0)
-        app.project_embedding = embeddings.pop(0)
+        if cached is None or cached["versions"]["job"] != versions["job"]:
+            # 1. Synchronous Work (DB Fetch) on the "db" executor
+            print("INFO: Starting synchronous DB fetch...")
+            job_data, applicant_profiles = await EXECUTORS.run(
+                "db", get_job_and_applicants_data, job_id, llm_model_name, embedding_model_name
+            )
+            rows, fallback_ids = [], []
+            if applicant_profiles:
+                # 2. Async LLM + embedding work, then CPU-bound components
+                components, fallback_ids = await score_applicant_components(job_data, applicant_profiles, **scoring)
+                rows = _cache_rows(applicant_profiles, components)
+        else:
+            current, known = versions["applicants"], cached["versions"]["applicants"]
+            rescore = {a for a, version in current.items() if known.get(a) != version}
+            rescore.update(a for a in stale if a in current)
+            kept = [row for row in cached["applicants"] if row["id"] in current]
+            if not rescore and len(kept) == len(cached["applicants"]):
+                print(f"INFO: Shortlist cache hit for {job_id}.")
+                if stale:
+                    await EXECUTORS.run("io", clear_stale_applicants, job_id, stale)
+                return cached["applicants"]
+
+            # Rescore only the changed applicants; withdrawn ones are dropped
+            print(
+                f"INFO: Shortlist cache hit for {job_id}; rescoring {len(rescore)} applicant(s), "
+                f"dropping {len(cached['applicants']) - len(kept)}."
+            )
+            fresh, fallback_ids = {}, []
+            if rescore:
+                job_data, applicant_profiles = await EXECUTORS.run(
+                    "db", get_job_and_applicants_data, job_id, llm_model_name, embedding_model_name, sorted(rescore)
+                )
+                if applicant_profiles:
+                    components, fallback_ids = await score_applicant_components(
+                        job_data, applicant_profiles, **scoring
+                    )
+                    fresh = {row["id"]: row for row in _cache_rows(applicant_profiles, components)}
 
-    # 3. Synchronous Work (Final Calculation) in a threadpool
+            # Rescored applicants keep their position, new ones are appended
+            rows = []
+            for row in kept:
+                if row["id"] in rescore:
+                    row = fresh.pop(row["id"], None)
+                if row is not None:
+                    rows.append(row)
+            rows.extend(fresh.values())
+
+        await EXECUTORS.run("io", cache_components, job_id, llm_model_name, embedding_model_name, rows, versions)
+        # Only once the rescored rows are cached: after a failure the markers are still queued
+        if stale:
+            await EXECUTORS.run("io", clear_stale_applicants, job_id, set(stale) - set(fallback_ids))
+        # Fallback project levels are served now but retried with the LLM on the next read
+        if fallback_ids:
+            await EXECUTORS.run("io", mark_applicants_stale, job_id, fallback_ids)
+        return rows
+
+    rows = await _COMPONENT_FLIGHTS.do(job_id, load_components)
+
+    # 3. Re-weight the cached components and rank (no refetch)
     print("INFO: Calculating final shortlist scores...")
-    
-    # Calculate the final scores using the synchronous math logic
-    return await run_in_threadpool(
-        calculate_shortlist, 
-        job=job_data, 
-        applicants=applicant_profiles,
-        job_embedding=job_embedding,
-        custom_weights=weights
+    components = {
+        name: np.array([row["components"][name] for row in rows], dtype=np.float64)
+        for name in BREAKDOWN_KEYS
+    }
+    return rank_components(
+        [row["id"] for row in rows], [row["name"] for row in rows], components,
+        weights, top_k=top_k, offset=offset
     )
\ No newline at end of file
@@ -0,0 +1,51 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+# -------------------------------------------------
+# In-flight request coalescing
+# -------------------------------------------------
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key: the first caller starts the
+    computation and later callers await the same result (or exception) instead
+    of repeating it. Nothing is kept once the call finishes; caching is separate.
+
+    The computation runs as its own task and waiters are shielded, so a client
+    disconnecting does not cancel the work other callers are waiting on.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the exception as retrieved even if every waiter has gone away
+        if not task.cancelled():
+            task.exception()
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._calls.get(key)
+        if task is None:
+            self.started += 1
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        else:
+            self.coalesced += 1
+            print(f"INFO: {self.name}: joined in-flight call for {key}.")
+        return await asyncio.shield(task)
+
+    def has(self, key: Hashable) -> bool:
+        """True if a call for `key` is in progress (a new caller would join it)."""
+        return key in self._calls
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def stats(self) -> Dict[str, int]:
+        return {"in_flight": self.in_flight(), "started": self.started, "coalesced": self.coalesced}
@@ -0,0 +1,88 @@
+import re
+import json
+import json_repair
+from typing import Callable, Optional, Type, TypeVar
+from fastapi import HTTPException
+from pydantic import BaseModel, ValidationError
+
+from api.config.config import STRUCTURED_OUTPUT_RETRIES
+
+T = TypeVar("T", bound=BaseModel)
+
+_FENCE_RE = re.compile(r"^```[a-zA-Z]*\s*|\s*```$")
+
+
+# -------------------------------------------------
+# Shared LLM structured-output handling
+# -------------------------------------------------
+class StructuredOutputError(Exception):
+    """The LLM output could not be turned into the expected model."""
+
+    def __init__(self, reason: str, raw: str):
+        super().__init__(reason)
+        self.reason = reason
+        self.raw = raw
+
+
+def _json_candidate(raw: str) -> str:
+    """Strips markdown fences and any preamble/postamble around the outermost object."""
+    text = _FENCE_RE.sub("", raw.strip())
+    start, end = text.find("{"), text.rfind("}")
+    if start != -1 and end > start:
+        return text[start:end + 1]
+    return text
+
+
+def parse_structured(raw: str, model: Type[T]) -> T:
+    """
+    Strict JSON parse, then a local repair pass (unquoted keys, trailing
+    commas, truncated output, ...), then Pydantic validation. No LLM calls.
+    """
+    text = _json_candidate(raw or "")
+    try:
+        obj = json.loads(text)
+    except json.JSONDecodeError:
+        obj = json_repair.loads(text)
+
+    if not isinstance(obj, dict):
+        raise StructuredOutputError("Output is not a JSON object.", raw)
+
+    try:
+        return model.model_validate(obj)
+    except ValidationError as e:
+        errors = "; ".join(
+            f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()[:5]
+        )
+        raise StructuredOutputError(f"Schema validation failed: {errors}", raw)
+
+
+def retry_feedback(error: StructuredOutputError) -> str:
+    """Instruction appended to the prompt for the retry (also changes the LM cache key)."""
+    return (
+        f"\n\nYour previous reply could not be used ({error.reason[:300]}). "
+        "Reply again with ONLY the corrected JSON object."
+    )
+
+
+def generate_structured(
+    generate: Callable[[Optional[str]], str],
+    model: Type[T],
+    label: str = "LLM",
+    max_retries: int = STRUCTURED_OUTPUT_RETRIES
+) -> T:
+    """
+    Calls `generate(feedback)` for raw LLM text and returns a validated `model`.
+    `feedback` is None on the first call and describes the failure on retries.
+    After `max_retries` extra attempts the request fails with HTTP 500.
+    """
+    feedback = None
+    for attempt in range(max_retries + 1):
+        raw = generate(feedback)
+        try:
+            return parse_structured(raw, model)
+        except StructuredOutputError as e:
+            print(f"WARNING: {label} output unusable (attempt {attempt + 1}/{max_retries + 1}): {e.reason}")
+            error = e
+            feedback = retry_feedback(e)
+
+    raise HTTPException(500, f"AI Error: {label} returned invalid JSON. ({error.reason})")
@@ -0,0 +1,81 @@
+import uuid
+from typing import Optional
+from psycopg2.extras import execute_values
+
+from api.config.config import VERIFY_CACHE_BACKEND, VERIFY_CACHE_PATH, VERIFY_CACHE_TTL, VERIFY_CACHE_MAX_ITEMS
+from api.utils.db import get_db_connection
+from api.utils.result_cache import create_cache_backend
+from api.utils.shortlister_utils import normalize_skill
+
+# Verification results keyed by owner/repo@sha + prompt version + model.
+# Opened on first use, falling back to memory if the SQLite file cannot be created.
+VERIFY_CACHE = create_cache_backend(
+    VERIFY_CACHE_BACKEND,
+    path=VERIFY_CACHE_PATH,
+    max_items=VERIFY_CACHE_MAX_ITEMS,
+    default_ttl=VERIFY_CACHE_TTL
+)
+
+
+def verification_cache_key(owner: str, repo: str, commit_sha: str, prompt_version: str, model_name: str) -> str:
+    # GitHub owner/repo names are case-insensitive
+    return f"verify:{prompt_version}:{model_name}:{owner.lower()}/{repo.lower()}@{commit_sha}"
+
+
+def get_cached_verification(key: str) -> Optional[dict]:
+    return VERIFY_CACHE.get(key)
+
+
+def cache_verification(key: str, result: dict) -> None:
+    VERIFY_CACHE.set(key, result)
+
+
+def store_verification(applicant_id: str, repo_url: str, repo_name: str, result: dict) -> None:
+    """
+    Writes a verification result to the applicant's "Project" (one row per
+    GitHub URL) and "VerifiedSkill" rows. A skill verified by several repos
+    keeps its highest mastery level.
+    """
+    skills = {}
+    for item in result["verified_skills"]:
+        key = normalize_skill(item["skill"])
+        if key and (key not in skills or item["mastery_level"] > skills[key][1]):
+            skills[key] = (item["skill"], item["mastery_level"])
+
+    with get_db_connection() as conn, conn.cursor() as cursor:
+        cursor.execute(
+            """
+            UPDATE "Project"
+            SET "projectLevel" = %s, "analysis" = %s, "codeQualityScore" = %s, "updatedAt" = CURRENT_TIMESTAMP
+            WHERE "applicantId" = %s AND "githubUrl" = %s
+            """,
+            (result["project_level"], result["analysis"], result["code_quality_score"], applicant_id, repo_url)
+        )
+        if cursor.rowcount == 0:
+            cursor.execute(
+                """
+                INSERT INTO "Project" ("id", "title", "githubUrl", "projectLevel", "analysis", "codeQualityScore", "applicantId")
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+                """,
+                (
+                    str(uuid.uuid4()), repo_name, repo_url, result["project_level"],
+                    result["analysis"], result["code_quality_score"], applicant_id
+                )
+            )
+
+        if skills:
+            execute_values(
+                cursor,
+                """
+                INSERT INTO "VerifiedSkill" ("id", "skillName", "skillNameNormalized", "masteryLevel", "applicantId")
+                VALUES %s
+                ON CONFLICT ("applicantId", "skillNameNormalized") DO UPDATE
+                SET "skillName" = EXCLUDED."skillName", "masteryLevel" = EXCLUDED."masteryLevel",
+                    "updatedAt" = CURRENT_TIMESTAMP
+                WHERE "VerifiedSkill"."masteryLevel" < EXCLUDED."masteryLevel"
+                """,
+                [
+                    (str(uuid.uuid4()), name, key, level, applicant_id)
+                    for key, (name, level) in skills.items()
+                ]
+            )
@@ -0,0 +1,154 @@
+"""
+Times the skill verifier's repository fetch stage against a local fake GitHub API.
+
+The fake server adds a fixed latency per request (roughly a GitHub round trip)
+and serves a synthetic repository. Compares the previous sequential per-file
+fetch with the tarball and concurrent-blob strategies in api/utils/github_fetch.py
+(which also rank and budget-pack the files, so their context sizes differ).
+
+Usage (from backend/):
+    python -m benchmarks.bench_github_fetch --latency-ms 150 --files 200 --repeat 3
+"""
+import io
+import os
+import json
+import time
+import tarfile
+import argparse
+import statistics
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, unquote
+
+OWNER, REPO, BRANCH = "octo", "demo", "main"
+
+
+def make_repo(n_files: int) -> dict:
+    files = {
+        "README.md": "# Demo\n" + "Some documentation.\n" * 50,
+        "requirements.txt": "fastapi\nrequests\n",
+        "app.py": "from fastapi import FastAPI\napp = FastAPI()\n" * 20,
+    }
+    for i in range(n_files):
+        files[f"pkg/module_{i:03d}.py"] = f"def f_{i}(x):\n    return x * {i}\n" * 30
+    return files
+
+
+def make_tarball(files: dict) -> bytes:
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w:gz") as tar:
+        for path, text in files.items():
+            data = text.encode()
+            info = tarfile.TarInfo(f"{OWNER}-{REPO}-abc123/{path}")
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return buf.getvalue()
+
+
+def start_fake_github(files: dict, latency: float):
+    tarball = make_tarball(files)
+    prefix = f"/repos/{OWNER}/{REPO}"
+    counter = {"requests": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send(self, status: int, body: bytes, content_type: str = "application/json"):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            counter["requests"] += 1
+            time.sleep(latency)
+            path = unquote(urlparse(self.path).path)
+            if path == prefix:
+                return self._send(200, json.dumps({"default_branch": BRANCH}).encode())
+            if path.startswith(f"{prefix}/commits/"):
+                return self._send(200, b"abc123abc123abc123abc123abc123abc123abcd", "text/plain")
+            if path.startswith(f"{prefix}/git/trees/"):
+                tree = [{"path": p, "type": "blob"} for p in files]
+                return self._send(200, json.dumps({"tree": tree}).encode())
+            if path.startswith(f"{prefix}/tarball"):
+                return self._send(200, tarball, "application/gzip")
+            if path.startswith(f"{prefix}/contents/"):
+                file_path = path[len(f"{prefix}/contents/"):]
+                if file_path in files:
+                    return self._send(200, files[file_path].encode(), "text/plain")
+            return self._send(404, b'{"message": "Not Found"}')
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, counter
+
+
+LEGACY_METADATA_FILES = ["README.md", "requirements.txt", "package.json", "pom.xml", "build.gradle"]
+LEGACY_PRIORITY = {"main.py", "app.py", "server.py", "index.py", "main.js", "app.js", "server.js", "index.js"}
+
+
+def legacy_select(paths: list) -> list:
+    source = [
+        p for p in paths
+        if p.endswith((".py", ".js", ".ts", ".java", ".go")) and "node_modules" not in p and ".venv" not in p
+    ]
+    priority = [p for p in source if os.path.basename(p) in LEGACY_PRIORITY]
+    others = [p for p in source if p not in priority]
+    return priority + others[:10 - len(priority)]
+
+
+def legacy_fetch(github_fetch) -> str:
+    """The previous behaviour: metadata, tree and each selected file fetched one at a time."""
+    context = ""
+    for path in LEGACY_METADATA_FILES:
+        text = github_fetch._fetch_raw_file(OWNER, REPO, path, BRANCH)
+        if text is not None:
+            context += f"\n\n--- FILE: {path} ---\n{text}"
+    branch = github_fetch._api_get(f"/repos/{OWNER}/{REPO}").json()["default_branch"]
+    tree = github_fetch._api_get(f"/repos/{OWNER}/{REPO}/git/trees/{branch}", params={"recursive": "1"}).json()
+    paths = [e["path"] for e in tree["tree"] if e["type"] == "blob"]
+    for path in legacy_select(paths):
+        text = github_fetch._fetch_raw_file(OWNER, REPO, path, branch)
+        if text is not None:
+            context += f"\n\n--- FILE: {path} ---\n{text}"
+    return context
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency-ms", type=float, default=150)
+    parser.add_argument("--files", type=int, default=200, help="Number of source files in the fake repo")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    files = make_repo(args.files)
+    server, counter = start_fake_github(files, args.latency_ms / 1000)
+    # Point the fetcher at the fake server before it is imported
+    os.environ["GITHUB_API_URL"] = f"http://127.0.0.1:{server.server_port}"
+    from api.utils import github_fetch
+
+    strategies = {
+        "sequential (old)": legacy_fetch,
+        "tarball": lambda m: m.fetch_repo_code_context(OWNER, REPO, mode="tarball")[0],
+        "concurrent blobs": lambda m: m.fetch_repo_code_context(OWNER, REPO, mode="blobs")[0],
+    }
+
+    print(f"{'strategy':<18} {'median ms':>10} {'requests':>9} {'context chars':>14}")
+    for name, fn in strategies.items():
+        samples = []
+        for _ in range(args.repeat):
+            counter["requests"] = 0
+            start = time.perf_counter()
+            context = fn(github_fetch)
+            samples.append((time.perf_counter() - start) * 1000)
+        print(f"{name:<18} {statistics.median(samples):>10.1f} {counter['requests']:>9} {len(context):>14}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Times resume PDF extraction over a local corpus of sample PDFs.
+
+Compares the old two-pass path (pdfplumber opened twice, text built with +=)
+with the single-pass `extract_pdf` in accurate and fast (pypdfium2) modes.
+
+Usage (from backend/):
+    python -m benchmarks.bench_pdf_extract path/to/pdf_dir --repeat 5 --max-pages 20
+"""
+import io
+import time
+import argparse
+import statistics
+from pathlib import Path
+
+import pdfplumber
+
+from api.utils.pdf_utils import extract_pdf
+
+
+def legacy_extract(content: bytes):
+    """The previous behaviour: one pdfplumber pass for text, another for links."""
+    text = ""
+    with pdfplumber.open(io.BytesIO(content)) as pdf:
+        for page in pdf.pages:
+            text += (page.extract_text() or "") + "\n"
+    links = []
+    with pdfplumber.open(io.BytesIO(content)) as pdf:
+        for page in pdf.pages:
+            for annot in page.annots or []:
+                if annot.get("uri"):
+                    links.append(annot["uri"])
+    return text, links
+
+
+def time_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("corpus", type=Path, help="Directory containing sample .pdf files")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-pages", type=int, default=0, help="Page limit for extract_pdf (0 = all)")
+    args = parser.parse_args()
+
+    files = sorted(args.corpus.glob("*.pdf"))
+    if not files:
+        raise SystemExit(f"No PDFs found in {args.corpus}")
+
+    print(f"{'file':<32} {'KB':>7} {'legacy ms':>10} {'accurate ms':>12} {'fast ms':>9}")
+    totals = {"legacy": 0.0, "accurate": 0.0, "fast": 0.0}
+    for path in files:
+        content = path.read_bytes()
+        results = {
+            "legacy": time_ms(lambda: legacy_extract(content), args.repeat),
+            "accurate": time_ms(lambda: extract_pdf(content, args.max_pages, mode="accurate"), args.repeat),
+            "fast": time_ms(lambda: extract_pdf(content, args.max_pages, mode="fast"), args.repeat),
+        }
+        for key, value in results.items():
+            totals[key] += value
+        print(f"{path.name[:32]:<32} {len(content) / 1024:>7.1f} "
+              f"{results['legacy']:>10.1f} {results['accurate']:>12.1f} {results['fast']:>9.1f}")
+
+    print(f"{'TOTAL':<32} {'':>7} {totals['legacy']:>10.1f} {totals['accurate']:>12.1f} {totals['fast']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+-- CreateTable
+CREATE TABLE "ProjectLevelAssessment" (
+    "applicantId" TEXT NOT NULL,
+    "modelName" TEXT NOT NULL,
+    "textHash" TEXT NOT NULL,
+    "projectLevel" TEXT NOT NULL,
+    "updatedAt" TIMESTAMP(3) NOT NULL,
+
+    CONSTRAINT "ProjectLevelAssessment_pkey" PRIMARY KEY ("applicantId","modelName")
+);
+
+-- AddForeignKey
+ALTER TABLE "ProjectLevelAssessment" ADD CONSTRAINT "ProjectLevelAssessment_applicantId_fkey" FOREIGN KEY ("applicantId") REFERENCES "Applicant"("id") ON DELETE CASCADE ON UPDATE CASCADE;
@@ -0,0 +1,15 @@
+-- CreateTable
+CREATE TABLE "ApplicantFeature" (
+    "applicantId" TEXT NOT NULL,
+    "embeddingModel" TEXT NOT NULL,
+    "resumeHash" TEXT NOT NULL,
+    "projectHash" TEXT NOT NULL,
+    "resumeEmbedding" BYTEA NOT NULL,
+    "projectEmbedding" BYTEA NOT NULL,
+    "updatedAt" TIMESTAMP(3) NOT NULL,
+
+    CONSTRAINT "ApplicantFeature_pkey" PRIMARY KEY ("applicantId")
+);
+
+-- AddForeignKey
+ALTER TABLE "ApplicantFeature" ADD CONSTRAINT "ApplicantFeature_applicantId_fkey" FOREIGN KEY ("applicantId") REFERENCES "Applicant"("id") ON DELETE CASCADE ON UPDATE CASCADE;